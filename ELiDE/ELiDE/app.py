@@ -418,27 +418,28 @@ class ELiDEApp(App):
         selection = self.selection
         if selection is None:
             return
+        mainscreen = self.mainscreen
         if isinstance(selection, GraphArrowWidget):
+            board = mainscreen.boardview.board
             if selection.reciprocal and selection.reciprocal.portal.get(
                     'is_mirror', False):
                 selection.reciprocal.portal.delete()
-                self.mainscreen.boardview.board.rm_arrow(
-                    selection.destination.name, selection.origin.name)
-            self.mainscreen.boardview.board.rm_arrow(
-                selection.origin.name, selection.destination.name)
+                board.rm_arrow(selection.destination.name,
+                               selection.origin.name)
+            board.rm_arrow(selection.origin.name, selection.destination.name)
             selection.portal.delete()
         elif isinstance(selection, GraphSpot):
             charn = selection.board.character.name
-            self.mainscreen.graphboards[charn].rm_spot(selection.name)
-            gridb = self.mainscreen.gridboards[charn]
+            mainscreen.graphboards[charn].rm_spot(selection.name)
+            gridb = mainscreen.gridboards[charn]
             if selection.name in gridb.spot:
                 gridb.rm_spot(selection.name)
             selection.proxy.delete()
         else:
             assert isinstance(selection, Pawn)
             charn = selection.board.character.name
-            self.mainscreen.graphboards[charn].rm_pawn(selection.name)
-            self.mainscreen.gridboards[charn].rm_pawn(selection.name)
+            mainscreen.graphboards[charn].rm_pawn(selection.name)
+            mainscreen.gridboards[charn].rm_pawn(selection.name)
             selection.proxy.delete()
         self.selection = None
 
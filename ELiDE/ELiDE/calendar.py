@@ -132,32 +132,24 @@ class CalendarOptionButton(CalendarWidget, Button):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._make_modalview()
-        self._update_modalview()
-        self.bind(cols=self._make_modalview)
-        self.bind(options=self._update_modalview)
-        self.bind(on_release=self.modalview.open)
-
-    def _make_modalview(self, *args):
-        if not self.modalview:
+        self.bind(cols=self._update_modalview,
+                  options=self._update_modalview)
+
+    def on_release(self, *args):
+        # Most option buttons never get pressed, so don't make the
+        # modal until one is; after that, keep it around
+        if self.modalview is None:
             self.modalview = ModalView()
-        if self.modalview.children:
-            container = self.modalview.children[0]
-        else:
-            container = GridLayout(cols=self.cols)
-            self.modalview.add_widget(container)
-        container.size = container.minimum_size
-        self._update_modalview()
+            self.modalview.add_widget(GridLayout(cols=self.cols))
+            self._update_modalview()
+        self.modalview.open()
 
     def _update_modalview(self, *args):
-        if not self.modalview:
-            Clock.schedule_once(self.on_options, 0)
+        if self.modalview is None:
             return
-        if not self.modalview.children:
-            container = GridLayout(cols=self.cols)
-            self.modalview.add_widget(container)
-        else:
-            container = self.modalview.children[0]
+        container = self.modalview.children[0]
+        container.cols = self.cols
+        container.clear_widgets()
         for option in self.options:
             if type(option) is tuple:
                 text, value = option
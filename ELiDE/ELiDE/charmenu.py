@@ -19,7 +19,7 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.properties import (BooleanProperty, ObjectProperty,
                              ReferenceListProperty)
 from .graph.arrow import GraphArrowWidget
-from .util import try_load, dummynum
+from .util import try_load
 from LiSE.proxy import CharStatProxy
 
 
@@ -107,8 +107,7 @@ class CharMenu(BoxLayout):
             dummyplace.clear()
             if self.app.spotcfg.prefix:
                 dummyplace.prefix = self.app.spotcfg.prefix
-                dummyplace.num = dummynum(self.app.character,
-                                          dummyplace.prefix) + 1
+                dummyplace.num = self.screen.dummynum(dummyplace.prefix) + 1
             if self.app.spotcfg.imgpaths:
                 dummyplace.paths = self.app.spotcfg.imgpaths
             else:
@@ -127,8 +126,7 @@ class CharMenu(BoxLayout):
             dummything.clear()
             if self.app.pawncfg.prefix:
                 dummything.prefix = self.app.pawncfg.prefix
-                dummything.num = dummynum(self.app.character,
-                                          dummything.prefix) + 1
+                dummything.num = self.screen.dummynum(dummything.prefix) + 1
             if self.app.pawncfg.imgpaths:
                 dummything.paths = self.app.pawncfg.imgpaths
             else:
@@ -152,7 +150,7 @@ class CharMenu(BoxLayout):
                                              destination=self.ids.emptyleft)
             self.ids.portaladdbut.add_widget(self.revarrow)
         else:
-            if hasattr(self, 'revarrow'):
+            if self.revarrow is not None:
                 self.ids.portaladdbut.remove_widget(self.revarrow)
                 self.revarrow = None
 
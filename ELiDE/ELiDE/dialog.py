@@ -47,6 +47,25 @@ class ScrollableLabel(ScrollView):
     line_spacing = NumericProperty(0)
     text = StringProperty()
 
+    def on_kv_post(self, *args):
+        label = self.ids.label
+        label.fbind('texture_size', self._upd_label_height)
+        label.fbind('width', self._upd_label_text_size)
+        self._upd_label_text_size(label, label.width)
+        self._upd_label_height(label, label.texture_size)
+
+    @staticmethod
+    def _upd_label_height(label, texture_size):
+        # Don't relayout the ScrollView over sub-pixel differences
+        if abs(label.height - texture_size[1]) > 0.5:
+            label.height = texture_size[1]
+
+    @staticmethod
+    def _upd_label_text_size(label, width):
+        text_width = label.text_size[0]
+        if text_width is None or abs(text_width - width) > 1:
+            label.text_size = width, None
+
 
 class MessageBox(Box):
     """Looks like a TextInput but doesn't accept any input.
@@ -80,10 +99,11 @@ class DialogMenu(Box):
         if not hasattr(self, '_sv'):
             self._sv = ScrollView(size=self.size, pos=self.pos)
             self.bind(size=self._set_sv_size, pos=self._set_sv_pos)
-            layout = BoxLayout(orientation='vertical')
+            layout = self._layout = BoxLayout(orientation='vertical')
             self._sv.add_widget(layout)
+            self.add_widget(self._sv)
         else:
-            layout = self._sv.children[0]
+            layout = self._layout
             layout.clear_widgets()
         for txt, part in self.options:
             if not callable(part):
@@ -295,9 +315,8 @@ Builder.load_string("""
             rgba: 1, 1, 1, 1
 <ScrollableLabel>:
     Label:
+        id: label
         size_hint_y: None
-        height: self.texture_size[1]
-        text_size: self.width, None
         text: root.text
         color: root.color
 <MessageBox>:
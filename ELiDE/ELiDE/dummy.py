@@ -56,10 +56,12 @@ class Dummy(ImageStack):
         :class:`graph.Pawn` instance.
 
         """
-        if not self.collide_point(*touch.pos):
+        tx, ty = touch.pos
+        if not self.collide_point(tx, ty):
             return False
-        self.pos_start = self.pos
-        self.pos_down = (self.x - touch.x, self.y - touch.y)
+        x, y = self.pos
+        self.pos_start = x, y
+        self.pos_down = (x - tx, y - ty)
         touch.grab(self)
         self._touch = touch
         return True
@@ -79,8 +81,8 @@ class Dummy(ImageStack):
         """
         if touch is not self._touch:
             return False
-        self.pos_up = self.pos
-        self.pos = self.pos_start
+        self.pos_up = self.x, self.y
+        self.pos = self.x_start, self.y_start
         self._touch = None
         return True
 
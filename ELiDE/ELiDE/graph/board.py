@@ -14,6 +14,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """The big widget that shows the graph of the selected Character."""
 from functools import partial
+from logging import DEBUG
 from kivy.properties import (BooleanProperty, ReferenceListProperty,
                              DictProperty, ObjectProperty, NumericProperty,
                              ListProperty, StringProperty)
@@ -93,6 +94,17 @@ class FinalLayout(FloatLayout):
     _trigger_finalize_all = trigger(finalize_all)
 
 
+class _PortalDraft:
+    """The widgets standing in for a portal while the user drags it out"""
+    __slots__ = ('origspot', 'protodest', 'protoportal', 'protoportal2')
+
+    def __init__(self, origspot, protodest, protoportal, protoportal2=None):
+        self.origspot = origspot
+        self.protodest = protodest
+        self.protoportal = protoportal
+        self.protoportal2 = protoportal2
+
+
 class GraphBoard(RelativeLayout):
     """A graphical view onto a :class:`LiSE.Character`, resembling a game
     graph.
@@ -129,6 +141,15 @@ class GraphBoard(RelativeLayout):
     _scheduled_rm_arrow = DictProperty()
     _scheduled_discard_pawn = DictProperty()
     _scheduled_add_pawn = DictProperty()
+    _awaiting_texture = False
+
+    def __init__(self, **kwargs):
+        # Touch state, set to None when there isn't any
+        self._lasttouch = None
+        self._portal_draft = None
+        super().__init__(**kwargs)
+        # Every touch gets transformed with this, so only bind it once
+        self._to_local = self.to_local
 
     @property
     def widkwargs(self):
@@ -136,73 +157,97 @@ class GraphBoard(RelativeLayout):
 
     def on_touch_down(self, touch):
         """Check for collisions and select an appropriate entity."""
-        if hasattr(self, '_lasttouch') and self._lasttouch == touch:
+        if self._lasttouch == touch:
             return
         if not self.collide_point(*touch.pos):
             return
         touch.push()
-        touch.apply_transform_2d(self.to_local)
-        if self.app.selection:
-            if self.app.selection.collide_point(*touch.pos):
+        touch.apply_transform_2d(self._to_local)
+        x, y = touch.pos
+        selection = self.app.selection
+        if selection:
+            if selection.collide_point(x, y):
                 Logger.debug("Board: hit selection")
-                touch.grab(self.app.selection)
-        pawns = list(self.pawns_at(*touch.pos))
-        if pawns:
-            Logger.debug("Board: hit {} pawns".format(len(pawns)))
+                touch.grab(selection)
+        # Most touches miss most kinds of entity, so only build a list
+        # of candidates once there's at least one
+        hits = self.pawns_at(x, y)
+        first = next(hits, None)
+        if first is not None:
+            pawns = [first, *hits]
+            if Logger.isEnabledFor(DEBUG):
+                Logger.debug("Board: hit {} pawns".format(len(pawns)))
             self.selection_candidates = pawns
-            if self.app.selection in self.selection_candidates:
-                self.selection_candidates.remove(self.app.selection)
+            if selection in pawns:
+                self.selection_candidates.remove(selection)
             touch.pop()
             return True
-        spots = list(self.spots_at(*touch.pos))
-        if spots:
-            Logger.debug("Board: hit {} spots".format(len(spots)))
-            self.selection_candidates = spots
-            if self.adding_portal:
-                self.origspot = self.selection_candidates.pop(0)
-                self.protodest = Dummy(name='protodest',
-                                       pos=touch.pos,
-                                       size=(0, 0))
-                self.add_widget(self.protodest)
-                self.protodest.on_touch_down(touch)
-                self.protoportal = self.proto_arrow_cls(
-                    origin=self.origspot, destination=self.protodest)
-                self.add_widget(self.protoportal)
+        hits = self.spots_at(x, y)
+        first = next(hits, None)
+        if first is not None:
+            spots = [first, *hits]
+            if Logger.isEnabledFor(DEBUG):
+                Logger.debug("Board: hit {} spots".format(len(spots)))
+            if not self.adding_portal:
+                self.selection_candidates = spots
+            else:
+                origspot = first
+                self.selection_candidates = spots[1:]
+                protodest = Dummy(name='protodest', pos=touch.pos, size=(0, 0))
+                self.add_widget(protodest)
+                protodest.on_touch_down(touch)
+                protoportal = self.proto_arrow_cls(origin=origspot,
+                                                   destination=protodest)
+                self.add_widget(protoportal)
                 if self.reciprocal_portal:
-                    self.protoportal2 = self.proto_arrow_cls(
-                        destination=self.origspot, origin=self.protodest)
-                    self.add_widget(self.protoportal2)
+                    protoportal2 = self.proto_arrow_cls(destination=origspot,
+                                                        origin=protodest)
+                    self.add_widget(protoportal2)
+                else:
+                    protoportal2 = None
+                self._portal_draft = _PortalDraft(origspot, protodest,
+                                                  protoportal, protoportal2)
             touch.pop()
             return True
-        arrows = list(self.arrows_at(*touch.pos))
-        if arrows:
-            Logger.debug("Board: hit {} arrows".format(len(arrows)))
+        hits = self.arrows_at(x, y)
+        first = next(hits, None)
+        if first is not None:
+            arrows = [first, *hits]
+            if Logger.isEnabledFor(DEBUG):
+                Logger.debug("Board: hit {} arrows".format(len(arrows)))
             self.selection_candidates = arrows
-            if self.app.selection in self.selection_candidates:
-                self.selection_candidates.remove(self.app.selection)
-            if isinstance(
-                    self.app.selection, GraphArrow
-            ) and self.app.selection.reciprocal in self.selection_candidates:
-                self.selection_candidates.remove(self.app.selection.reciprocal)
+            selection_candidates = self.selection_candidates
+            if selection in selection_candidates:
+                selection_candidates.remove(selection)
+            if isinstance(selection, GraphArrow
+                          ) and selection.reciprocal in selection_candidates:
+                selection_candidates.remove(selection.reciprocal)
             touch.pop()
             return True
         touch.pop()
 
     def on_touch_move(self, touch):
         """If an entity is selected, drag it."""
-        if hasattr(self, '_lasttouch') and self._lasttouch == touch:
+        if self._lasttouch == touch:
+            return
+        # Kivy keeps sending moves for a touch that's holding still;
+        # there's nothing to drag in those
+        if touch.x == touch.px and touch.y == touch.py:
             return
-        if self.app.selection in self.selection_candidates:
-            self.selection_candidates.remove(self.app.selection)
-        if self.app.selection:
-            if not self.selection_candidates:
+        app = self.app
+        selection = app.selection
+        selection_candidates = self.selection_candidates
+        if selection in selection_candidates:
+            selection_candidates.remove(selection)
+        if selection:
+            if not selection_candidates:
                 self.keep_selection = True
             ret = super().on_touch_move(touch)
             return ret
-        elif self.selection_candidates:
-            for cand in self.selection_candidates:
+        elif selection_candidates:
+            for cand in selection_candidates:
                 if cand.collide_point(*touch.pos):
-                    self.app.selection = cand
+                    app.selection = cand
                     cand.selected = True
                     touch.grab(cand)
                     ret = super().on_touch_move(touch)
@@ -210,16 +255,17 @@ class GraphBoard(RelativeLayout):
 
     def portal_touch_up(self, touch):
         """Try to create a portal between the spots the user chose."""
+        draft = self._portal_draft
         try:
             # If the touch ended upon a spot, and there isn't
             # already a portal between the origin and this
             # destination, create one.
             destspot = next(self.spots_at(*touch.pos))
-            orig = self.origspot.proxy
+            orig = draft.origspot.proxy
             dest = destspot.proxy
             if not (orig.name in self.character.portal
                     and dest.name in self.character.portal[orig.name]):
-                symmetrical = hasattr(self, 'protoportal2') and not (
+                symmetrical = draft.protoportal2 is not None and not (
                     orig.name in self.character.preportal
                     and dest.name in self.character.preportal[orig.name])
                 port = self.character.new_portal(orig.name,
@@ -232,31 +278,36 @@ class GraphBoard(RelativeLayout):
                             self.character.portal[dest.name][orig.name]))
         except StopIteration:
             pass
-        self.remove_widget(self.protoportal)
-        if hasattr(self, 'protoportal2'):
-            self.remove_widget(self.protoportal2)
-            del self.protoportal2
-        self.remove_widget(self.protodest)
-        del self.protoportal
-        del self.protodest
+        self.remove_widget(draft.protoportal)
+        if draft.protoportal2 is not None:
+            self.remove_widget(draft.protoportal2)
+        self.remove_widget(draft.protodest)
+        self._portal_draft = None
 
     def on_touch_up(self, touch):
         """Delegate touch handling if possible, else select something."""
-        if hasattr(self, '_lasttouch') and self._lasttouch == touch:
+        if self._lasttouch == touch:
             return
         self._lasttouch = touch
         touch.push()
-        touch.apply_transform_2d(self.to_local)
-        if hasattr(self, 'protodest'):
+        touch.apply_transform_2d(self._to_local)
+        if self._portal_draft is not None:
             Logger.debug("Board: on_touch_up making a portal")
             touch.ungrab(self)
             ret = self.portal_touch_up(touch)
             touch.pop()
             return ret
-        if self.app.selection and hasattr(self.app.selection, 'on_touch_up'):
-            self.app.selection.dispatch('on_touch_up', touch)
+        app = self.app
+        selection = app.selection
+        if selection and hasattr(selection, 'on_touch_up'):
+            selection.dispatch('on_touch_up', touch)
+        # Work out what kind of thing the selection is just the once
+        selection_selectable = hasattr(selection, 'selected')
+        selection_reciprocal = selection.reciprocal if isinstance(
+            selection, GraphArrow) else None
+        x, y = touch.pos
         for candidate in self.selection_candidates:
-            if candidate.collide_point(*touch.pos):
+            if candidate.collide_point(x, y):
                 if hasattr(candidate, 'selected'):
                     if isinstance(candidate,
                                   GraphArrow) and candidate.reciprocal:
@@ -268,35 +319,42 @@ class GraphBoard(RelativeLayout):
                                 'is_mirror', False):
                             candidate.reciprocal.selected = True
                     candidate.selected = True
-                if hasattr(self.app.selection, 'selected'):
-                    self.app.selection.selected = False
-                    if isinstance(self.app.selection, GraphArrow) and self.app.selection.reciprocal\
-                            and candidate is not self.app.selection.reciprocal:
-                        self.app.selection.reciprocal.selected = False
-                self.app.selection = candidate
+                if selection_selectable:
+                    selection.selected = False
+                    if selection_reciprocal \
+                            and candidate is not selection_reciprocal:
+                        selection_reciprocal.selected = False
+                app.selection = candidate
                 self.keep_selection = True
                 parent = candidate.parent
                 parent.remove_widget(candidate)
                 parent.add_widget(candidate)
                 break
         if not self.keep_selection:
-            Logger.debug("Board: deselecting " + repr(self.app.selection))
-            if hasattr(self.app.selection, 'selected'):
-                self.app.selection.selected = False
-                if isinstance(self.app.selection,
-                              GraphArrow) and self.app.selection.reciprocal:
-                    self.app.selection.reciprocal.selected = False
-            self.app.selection = None
+            if Logger.isEnabledFor(DEBUG):
+                Logger.debug("Board: deselecting " + repr(selection))
+            if selection_selectable:
+                selection.selected = False
+                if selection_reciprocal:
+                    selection_reciprocal.selected = False
+            app.selection = None
         self.keep_selection = False
         touch.ungrab(self)
         touch.pop()
         return
 
     def _pull_size(self, *args):
-        if self.wallpaper.texture is None:
-            Clock.schedule_once(self._pull_size, 0.001)
+        wallpaper = self.wallpaper
+        if wallpaper.texture is None:
+            # Get called back when the texture loads, rather than polling
+            if not self._awaiting_texture:
+                wallpaper.fbind('texture', self._pull_size)
+                self._awaiting_texture = True
             return
-        self.size = self.wallpaper.size = self.wallpaper.texture.size
+        if self._awaiting_texture:
+            wallpaper.funbind('texture', self._pull_size)
+            self._awaiting_texture = False
+        self.size = wallpaper.size = wallpaper.texture.size
 
     def _pull_image(self, *args):
         self.wallpaper.source = self.wallpaper_path
@@ -454,8 +512,10 @@ class GraphBoard(RelativeLayout):
         # think there will be, so, insurance
         self.rm_arrows_to_and_from(name)
         pwn = self.pawn.pop(name)
-        if pwn in self.selection_candidates:
+        try:
             self.selection_candidates.remove(pwn)
+        except ValueError:
+            pass
         pwn.parent.remove_widget(pwn)
 
     def _trigger_rm_pawn(self, name):
@@ -466,8 +526,10 @@ class GraphBoard(RelativeLayout):
         if name not in self.spot:
             raise KeyError("No Spot named {}".format(name))
         spot = self.spot.pop(name)
-        if spot in self.selection_candidates:
+        try:
             self.selection_candidates.remove(spot)
+        except ValueError:
+            pass
         pawns_here = list(spot.children)
         self.rm_arrows_to_and_from(name)
         self.spotlayout.remove_widget(spot)
@@ -479,25 +541,30 @@ class GraphBoard(RelativeLayout):
 
     def _trigger_rm_spot(self, name):
         part = partial(self.rm_spot, name)
-        if name in self._scheduled_rm_spot:
-            Clock.unschedule(self._scheduled_rm_spot[name])
+        scheduled = self._scheduled_rm_spot.get(name)
+        if scheduled is not None:
+            Clock.unschedule(scheduled)
         self._scheduled_rm_spot[name] = Clock.schedule_once(part, 0)
 
     def rm_arrow(self, orig, dest, *args):
         """Remove the :class:`Arrow` that goes from ``orig`` to ``dest``."""
-        if (orig not in self.arrow or dest not in self.arrow[orig]):
+        dests = self.arrow.get(orig)
+        if dests is None or dest not in dests:
             raise KeyError("No Arrow from {} to {}".format(orig, dest))
-        arr = self.arrow[orig].pop(dest)
-        if arr in self.selection_candidates:
+        arr = dests.pop(dest)
+        try:
             self.selection_candidates.remove(arr)
+        except ValueError:
+            pass
         self.arrowlayout.remove_widget(arr)
         if (orig, dest) in self._scheduled_rm_arrow:
             del self._scheduled_rm_arrow[orig, dest]
 
     def _trigger_rm_arrow(self, orig, dest):
         part = partial(self.rm_arrow, orig, dest)
-        if (orig, dest) in self._scheduled_rm_arrow:
-            Clock.unschedule(self._scheduled_rm_arrow[orig, dest])
+        scheduled = self._scheduled_rm_arrow.get((orig, dest))
+        if scheduled is not None:
+            Clock.unschedule(scheduled)
         self._scheduled_rm_arrow[orig, dest] = Clock.schedule_once(part, 0)
 
     def graph_layout(self, graph):
@@ -512,8 +579,9 @@ class GraphBoard(RelativeLayout):
 
     def _trigger_discard_pawn(self, thing):
         part = partial(self.discard_pawn, thing)
-        if thing in self._scheduled_discard_pawn:
-            Clock.unschedule(self._scheduled_discard_pawn[thing])
+        scheduled = self._scheduled_discard_pawn.get(thing)
+        if scheduled is not None:
+            Clock.unschedule(scheduled)
         self._scheduled_discard_pawn[thing] = Clock.schedule_once(part, 0)
 
     def remove_absent_pawns(self, *args):
@@ -538,7 +606,7 @@ class GraphBoard(RelativeLayout):
                 self.rm_spot(spot_name)
 
     def discard_arrow(self, orign, destn, *args):
-        if (orign in self.arrow and destn in self.arrow[orign]):
+        if destn in self.arrow.get(orign, ()):
             self.rm_arrow(orign, destn)
 
     def _trigger_discard_arrow(self, orig, dest):
@@ -642,8 +710,9 @@ class GraphBoard(RelativeLayout):
 
     def _trigger_add_pawn(self, thingn):
         part = partial(self.add_pawn, thingn)
-        if thingn in self._scheduled_add_pawn:
-            Clock.unschedule(self._scheduled_add_pawn[thingn])
+        scheduled = self._scheduled_add_pawn.get(thingn)
+        if scheduled is not None:
+            Clock.unschedule(scheduled)
         self._scheduled_add_pawn[thingn] = Clock.schedule_once(part, 0)
 
     def add_new_pawns(self, *args):
@@ -751,13 +820,13 @@ class GraphBoard(RelativeLayout):
             else:
                 Logger.warning("Board: diff tried to change stats of node {} "
                                "but I don't have a widget for it".format(node))
+        arrowmap = self.arrow
         for (orig, dests) in delta.get('edges', {}).items():
             for (dest, extant) in dests.items():
-                if extant and (orig not in self.arrow
-                               or dest not in self.arrow[orig]):
+                has_arrow = dest in arrowmap.get(orig, ())
+                if extant and not has_arrow:
                     self.add_arrow(orig, dest)
-                elif not extant and orig in self.arrow and dest in self.arrow[
-                        orig]:
+                elif not extant and has_arrow:
                     self.rm_arrow(orig, dest)
 
     def trigger_update_from_delta(self, delta, *args):
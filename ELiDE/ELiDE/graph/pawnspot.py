@@ -201,8 +201,9 @@ class GraphPawnSpot(ImageStackProxy, Layout):
                 else:
                     subgroup.append(member)
             subgroups.append(subgroup)
-            content_height = max(
-                (content_height, sum(wid.height for wid in subgroups[0])))
+            pile_height = sum(wid.height for wid in subgroups[0])
+            if pile_height > content_height:
+                content_height = pile_height
             content_width += sum(
                 max(wid.width for wid in subgrp) for subgrp in subgroups)
             piles[group] = subgroups
@@ -227,7 +228,8 @@ class GraphPawnSpot(ImageStackProxy, Layout):
                     member.rel_pos = (offx, rel_y)
                     x, y = self.pos
                     member.pos = x + offx, y + rel_y
-                    subw = max((subw, member.width))
+                    if member.width > subw:
+                        subw = member.width
                     subh += member.height
                 offx += subw
             offx += gutter
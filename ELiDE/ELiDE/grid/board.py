@@ -1,14 +1,16 @@
 from functools import partial
+from itertools import chain
 
 from kivy.clock import Clock
 from kivy.logger import Logger
-from kivy.properties import (DictProperty, ListProperty, NumericProperty,
-                             ObjectProperty, ReferenceListProperty)
+from kivy.properties import (ListProperty, NumericProperty, ObjectProperty,
+                             ReferenceListProperty)
 from kivy.uix.relativelayout import RelativeLayout
 from kivy.lang.builder import Builder
 from .spot import GridSpot
 from .pawn import GridPawn
 from ..boardview import BoardView
+from ..util import trigger
 
 
 class GridBoard(RelativeLayout):
@@ -18,30 +20,46 @@ class GridBoard(RelativeLayout):
     tile_width = NumericProperty()
     tile_height = NumericProperty()
     tile_size = ReferenceListProperty(tile_width, tile_height)
-    pawn = DictProperty({})
-    spot = DictProperty({})
     spot_cls = ObjectProperty(GridSpot)
     pawn_cls = ObjectProperty(GridPawn)
 
+    def __init__(self, **kwargs):
+        # Nothing binds to these, so they needn't be properties
+        self.pawn = {}
+        self.spot = {}
+        self._add_spot_triggers = {}
+        self._add_pawn_triggers = {}
+        super().__init__(**kwargs)
+
     def do_layout(self, *args):
         Logger.debug("GridBoard laying out at size {}".format(self.size))
+        spotmap = self.spot
         rows = cols = 0
         colw = rowh = 0
-        for name, spot in self.spot.items():
-            row, col = name
-            rows = max((rows, row))
-            cols = max((cols, col))
-            colw = max((spot.width, colw))
-            rowh = max((spot.height, rowh))
+        for (row, col), tile in spotmap.items():
+            if row > rows:
+                rows = row
+            if col > cols:
+                cols = col
+            width, height = tile.size
+            if width > colw:
+                colw = width
+            if height > rowh:
+                rowh = height
         self.width = colw * cols
         self.height = rowh * rows
-        for name, tile in self.spot.items():
-            gx, gy = name
-            tile.pos = gx * colw, gy * rowh
+        for (gx, gy), tile in spotmap.items():
+            x = gx * colw
+            y = gy * rowh
+            if tile.x != x or tile.y != y:
+                tile.pos = x, y
 
     def add_spot(self, placen, *args):
-        if (placen in self.character.place and placen not in self.spot):
-            self.add_widget(self.make_spot(self.character.place[placen]))
+        if placen in self.spot:
+            return
+        place = self.character.place.get(placen)
+        if place is not None:
+            self.add_widget(self.make_spot(place))
 
     def make_spot(self, place):
         if place["name"] in self.spot:
@@ -58,130 +76,164 @@ class GridBoard(RelativeLayout):
         return r
 
     def _trigger_add_tile(self, placen):
-        part = partial(self.add_spot, placen)
-        Clock.unschedule(part)
-        Clock.schedule_once(part, 0)
+        trig = self._add_spot_triggers.get(placen)
+        if trig is None:
+            trig = self._add_spot_triggers[placen] = Clock.create_trigger(
+                partial(self.add_spot, placen))
+        trig()
 
     def add_new_spots(self, *args):
         placemap = self.character.place
         tilemap = self.spot
         default_image_paths = self.spot_cls.default_image_paths
         default_zeroes = [0] * len(default_image_paths)
-        places2add = []
+        # Lists of zeroes go into the patch unchanged, so share one per length
+        zeroes_of_len = {len(default_zeroes): default_zeroes}
+        # Allocate enough room up front, and trim off the excess after
+        places2add = [None] * len(placemap)
+        n = 0
         nodes_patch = {}
         for place_name, place in placemap.items():
             if not isinstance(place_name, tuple) or len(place_name) != 2:
                 continue
             if place_name not in tilemap:
-                places2add.append(place)
-                patch = {}
+                places2add[n] = place
+                n += 1
                 if '_image_paths' in place:
-                    zeroes = [0] * len(place['_image_paths'])
+                    if '_offxs' in place and '_offys' in place:
+                        continue
+                    npaths = len(place['_image_paths'])
+                    zeroes = zeroes_of_len.get(npaths)
+                    if zeroes is None:
+                        zeroes = zeroes_of_len[npaths] = [0] * npaths
+                    patch = nodes_patch[place_name] = {}
                 else:
-                    patch['_image_paths'] = default_image_paths
                     zeroes = default_zeroes
+                    patch = nodes_patch[place_name] = {
+                        '_image_paths': default_image_paths
+                    }
                 if '_offxs' not in place:
                     patch['_offxs'] = zeroes
                 if '_offys' not in place:
                     patch['_offys'] = zeroes
-                if patch:
-                    nodes_patch[place_name] = patch
+        del places2add[n:]
         if nodes_patch:
             self.character.node.patch(nodes_patch)
         make_tile = self.make_spot
         add_widget = self.add_widget
-        for place in places2add:
-            add_widget(make_tile(place))
+        spots_added = [make_tile(place) for place in places2add]
+        for spot in spots_added:
+            add_widget(spot)
+        return spots_added
 
     def add_pawn(self, thingn, *args):
-        if (thingn in self.character.thing and thingn not in self.pawn):
-            pwn = self.make_pawn(self.character.thing[thingn])
-            whereat = self.spot[pwn.proxy['location']]
-            whereat.add_widget(pwn)
-            self.pawn[thingn] = pwn
+        if thingn in self.pawn:
+            return
+        thing = self.character.thing.get(thingn)
+        if thing is not None:
+            pwn = self.make_pawn(thing)
+            self.spot[thing['location']].add_widget(pwn)
 
     def _trigger_add_pawn(self, thingn):
-        part = partial(self.add_pawn, thingn)
-        Clock.unschedule(part)
-        Clock.schedule_once(part, 0)
+        trig = self._add_pawn_triggers.get(thingn)
+        if trig is None:
+            trig = self._add_pawn_triggers[thingn] = Clock.create_trigger(
+                partial(self.add_pawn, thingn))
+        trig()
 
     def add_new_pawns(self, *args):
         nodes_patch = {}
-        things2add = []
-        pawns_added = []
+        thingmap = self.character.thing
+        # Allocate enough room up front, and trim off the excess after
+        things2add = [None] * len(thingmap)
+        n = 0
         pawnmap = self.pawn
         default_image_paths = GridPawn.default_image_paths
         default_zeroes = [0] * len(default_image_paths)
-        for thingn, thing in self.character.thing.items():
+        # Lists of zeroes go into the patch unchanged, so share one per length
+        zeroes_of_len = {len(default_zeroes): default_zeroes}
+        for thingn, thing in thingmap.items():
             if thingn not in pawnmap:
-                things2add.append(thing)
-                patch = {}
+                things2add[n] = thing
+                n += 1
                 if '_image_paths' in thing:
-                    zeroes = [0] * len(thing['_image_paths'])
+                    if '_offxs' in thing and '_offys' in thing:
+                        continue
+                    npaths = len(thing['_image_paths'])
+                    zeroes = zeroes_of_len.get(npaths)
+                    if zeroes is None:
+                        zeroes = zeroes_of_len[npaths] = [0] * npaths
+                    patch = nodes_patch[thingn] = {}
                 else:
-                    patch['_image_paths'] = default_image_paths
                     zeroes = default_zeroes
+                    patch = nodes_patch[thingn] = {
+                        '_image_paths': default_image_paths
+                    }
                 if '_offxs' not in thing:
                     patch['_offxs'] = zeroes
                 if '_offys' not in thing:
                     patch['_offys'] = zeroes
-                if patch:
-                    nodes_patch[thingn] = patch
+        del things2add[n:]
         if nodes_patch:
             self.character.node.patch(nodes_patch)
         make_pawn = self.make_pawn
         tilemap = self.spot
-        for thing in things2add:
-            pwn = make_pawn(thing)
-            pawns_added.append(pwn)
-            whereat = tilemap[thing['location']]
-            whereat.add_widget(pwn)
+        pawns_added = [None] * n
+        for i, thing in enumerate(things2add):
+            pawns_added[i] = pwn = make_pawn(thing)
+            tilemap[thing['location']].add_widget(pwn)
+        return pawns_added
 
     def on_parent(self, *args):
         if not self.parent or hasattr(self, '_parented'):
             return
         self._parented = True
-        self.update()
+        self._trigger_update()
 
     def remove_absent_pawns(self):
         pawnmap = self.pawn
         thingmap = self.character.thing
-        for name, pawn in list(pawnmap.items()):
-            if name not in thingmap:
-                pawn.parent.remove_widget(pawn)
-                del pawnmap[name]
+        for name in pawnmap.keys() - thingmap.keys():
+            pawn = pawnmap.pop(name)
+            pawn.parent.remove_widget(pawn)
 
     def remove_absent_spots(self):
         spotmap = self.spot
         placemap = self.character.place
         remove_widget = self.remove_widget
-        for name, spot in list(spotmap.items()):
-            if name not in placemap:
-                remove_widget(spot)
-                del spotmap[name]
+        for name in spotmap.keys() - placemap.keys():
+            remove_widget(spotmap.pop(name))
 
     def update(self, *args):
         self.remove_absent_pawns()
         self.remove_absent_spots()
-        self.add_new_spots()
-        self.add_new_pawns()
-        for spot in self.spot.values():
+        for spot in self.add_new_spots():
             spot.finalize()
-        for pawn in self.pawn.values():
+        for pawn in self.add_new_pawns():
             pawn.finalize()
+        # Anything add_spot or add_pawn made before now needs finalizing too
+        for wid in chain(self.spot.values(), self.pawn.values()):
+            if not getattr(wid, '_finalized', False):
+                wid.finalize()
+
+    _trigger_update = trigger(update)
 
     def rm_spot(self, name):
         spot = self.spot.pop(name)
-        if spot in self.selection_candidates:
+        try:
             self.selection_candidates.remove(spot)
+        except ValueError:
+            pass
         for pwn in spot.children:
             del self.pawn[pwn.name]
         self.remove_widget(spot)
 
     def rm_pawn(self, name):
         pwn = self.pawn.pop(name)
-        if pwn in self.selection_candidates:
+        try:
             self.selection_candidates.remove(pwn)
+        except ValueError:
+            pass
         pwn.parent.remove_widget(pwn)
 
     def update_from_delta(self, delta, *args):
@@ -193,16 +245,20 @@ class GridBoard(RelativeLayout):
 
         def rm_pawn(name):
             pwn = pawnmap.pop(name)
-            if pwn in selection_candidates:
+            try:
                 selection_candidates.remove(pwn)
+            except ValueError:
+                pass
             pwn.parent.remove_widget(pwn)
 
         remove_widget = self.remove_widget
 
         def rm_spot(name):
             spot = spotmap.pop(name)
-            if spot in selection_candidates:
+            try:
                 selection_candidates.remove(spot)
+            except ValueError:
+                pass
             for pwn in spot.children:
                 del pawnmap[pwn.name]
             remove_widget(spot)
@@ -240,9 +296,8 @@ class GridBoard(RelativeLayout):
                         "but I don't have a widget for it".format(node))
 
     def trigger_update_from_delta(self, delta, *args):
-        part = partial(self.update_from_delta, delta)
-        Clock.unschedule(part)
-        Clock.schedule_once(part, 0)
+        # Every delta has to be applied, so there's nothing to coalesce
+        Clock.schedule_once(partial(self.update_from_delta, delta), 0)
 
 
 class GridBoardView(BoardView):
@@ -41,7 +41,7 @@ from .charmenu import CharMenu
 from .graph.board import GraphBoardView
 from .grid.board import GridBoardView
 from .calendar import Agenda
-from .util import dummynum, trigger
+from .util import dummynum, dummynums, trigger
 
 Factory.register('CharMenu', cls=CharMenu)
 
@@ -204,16 +204,58 @@ class MainScreen(Screen):
     dummyplace = ObjectProperty()
     dummything = ObjectProperty()
     dummies = ReferenceListProperty(dummyplace, dummything)
+    touch_down_interceptors = ReferenceListProperty(timepanel, charmenu,
+                                                    statpanel, dummyplace,
+                                                    dummything)
+    touch_up_interceptors = ReferenceListProperty(timepanel, charmenu,
+                                                  statpanel)
     dialoglayout = ObjectProperty()
     visible = BooleanProperty()
     _touch = ObjectProperty(None, allownone=True)
     rules_per_frame = BoundedNumericProperty(10, min=1)
     tmp_block = BooleanProperty(False)
 
+    def __init__(self, **kwargs):
+        self._dummynum_cache = None
+        self._touch_down_rects = None
+        self._watching_rects = set()
+        super().__init__(**kwargs)
+
+    def on_kv_post(self, *args):
+        self.app.bind(character=self._clear_dummynum_cache)
+
     @property
     def app(self):
         return App.get_running_app()
 
+    def dummynum(self, prefix):
+        """Return the highest number any node in the current character has
+        after ``prefix`` in its name.
+
+        Indexes every prefix in the character's nodes the first time I'm
+        asked, and again after the character changes.
+
+        """
+        cache = self._dummynum_cache
+        if cache is None:
+            cache = self._dummynum_cache = dummynums(self.app.character)
+        if prefix not in cache:
+            if prefix[-1:].isdigit():
+                # The index can't tell where a prefix like this ends
+                cache[prefix] = dummynum(self.app.character, prefix)
+            else:
+                cache[prefix] = 0
+        return cache[prefix]
+
+    def _upd_dummynum_cache(self, dummy, num):
+        # A dummy's number goes up once its name has been used
+        cache = self._dummynum_cache
+        if cache is not None and num - 1 > cache.get(dummy.prefix, 0):
+            cache[dummy.prefix] = num - 1
+
+    def _clear_dummynum_cache(self, *args):
+        self._dummynum_cache = None
+
     def _update_adding_portal(self, *args):
         self.boardview.adding_portal = self.charmenu.portaladdbut.state == 'down'
 
@@ -306,27 +348,54 @@ class MainScreen(Screen):
 
     _trigger_remake_display = trigger(remake_display)
 
+    def on_touch_down_interceptors(self, *args):
+        watching = self._watching_rects
+        for wid in self.touch_down_interceptors:
+            if wid is None or wid in watching:
+                continue
+            wid.fbind('pos', self._forget_touch_down_rects)
+            wid.fbind('size', self._forget_touch_down_rects)
+            watching.add(wid)
+        self._touch_down_rects = None
+
+    def _forget_touch_down_rects(self, *args):
+        self._touch_down_rects = None
+
+    def _get_touch_down_rects(self):
+        """Return the bounding box of all the touch-down interceptors, and
+        a list of their own boxes paired with them
+
+        """
+        rects = [(wid.x, wid.y, wid.right, wid.top, wid)
+                 for wid in self.touch_down_interceptors if wid is not None]
+        if not rects:
+            return (0, 0, -1, -1), rects
+        lefts, bots, rights, tops, _ = zip(*rects)
+        return (min(lefts), min(bots), max(rights), max(tops)), rects
+
     def on_touch_down(self, touch):
         if self.visible:
             touch.grab(self)
-        for interceptor in (self.timepanel, self.charmenu, self.statpanel,
-                            self.dummyplace, self.dummything):
-            if interceptor.collide_point(*touch.pos):
-                interceptor.dispatch('on_touch_down', touch)
-                self.boardview.keep_selection = \
-                    self.gridview.keep_selection = True
-                return True
+        x, y = touch.pos
+        if self._touch_down_rects is None:
+            self._touch_down_rects = self._get_touch_down_rects()
+        (left, bot, right, top), rects = self._touch_down_rects
+        if left <= x <= right and bot <= y <= top:
+            for wleft, wbot, wright, wtop, interceptor in rects:
+                if wleft <= x <= wright and wbot <= y <= wtop:
+                    interceptor.dispatch('on_touch_down', touch)
+                    self.boardview.keep_selection = \
+                        self.gridview.keep_selection = True
+                    return True
         if self.dialoglayout.dispatch('on_touch_down', touch):
             return True
         return self.mainview.dispatch('on_touch_down', touch)
 
     def on_touch_up(self, touch):
-        if self.timepanel.collide_point(*touch.pos):
-            return self.timepanel.dispatch('on_touch_up', touch)
-        elif self.charmenu.collide_point(*touch.pos):
-            return self.charmenu.dispatch('on_touch_up', touch)
-        elif self.statpanel.collide_point(*touch.pos):
-            return self.statpanel.dispatch('on_touch_up', touch)
+        x, y = touch.pos
+        for interceptor in self.touch_up_interceptors:
+            if interceptor.collide_point(x, y):
+                return interceptor.dispatch('on_touch_up', touch)
         return self.mainview.dispatch('on_touch_up', touch)
 
     def on_dummies(self, *args):
@@ -340,7 +409,7 @@ class MainScreen(Screen):
             return
 
         def renum_dummy(dummy, *args):
-            dummy.num = dummynum(self.app.character, dummy.prefix) + 1
+            dummy.num = self.dummynum(dummy.prefix) + 1
 
         for dummy in self.dummies:
             if dummy is None or hasattr(dummy, '_numbered'):
@@ -349,9 +418,10 @@ class MainScreen(Screen):
                 self.app.pawncfg.bind(imgpaths=self._propagate_thing_paths)
             if dummy == self.dummyplace:
                 self.app.spotcfg.bind(imgpaths=self._propagate_place_paths)
-            dummy.num = dummynum(self.app.character, dummy.prefix) + 1
+            dummy.num = self.dummynum(dummy.prefix) + 1
             Logger.debug("MainScreen: dummy #{}".format(dummy.num))
-            dummy.bind(prefix=partial(renum_dummy, dummy))
+            dummy.bind(prefix=partial(renum_dummy, dummy),
+                       num=self._upd_dummynum_cache)
             dummy._numbered = True
 
     def _propagate_thing_paths(self, *args):
@@ -379,7 +449,6 @@ class MainScreen(Screen):
                 del chardelta[unwanted]
         self.boardview.board.trigger_update_from_delta(chardelta)
         self.gridview.board.trigger_update_from_delta(chardelta)
-        self.statpanel.statlist.mirror = dict(self.app.selected_proxy)
 
     def play(self, *args):
         """If the 'play' button is pressed, advance a turn.
@@ -390,7 +459,15 @@ class MainScreen(Screen):
         if self.playbut.state == 'normal' or not hasattr(self.app, 'engine') or \
                 self.app.engine is None or self.app.engine.closed:
             return
-        self.next_turn()
+        self.next_turn(cb=partial(self._play_again_if_late,
+                                  Clock.get_boottime()))
+
+    def _play_again_if_late(self, started, *args):
+        # If the turn took longer than the interval between plays,
+        # the wait for the next one is already over
+        if self.play_speed and \
+                Clock.get_boottime() - started >= 1.0 / self.play_speed:
+            Clock.schedule_once(self.play, 0)
 
     def _update_from_next_turn(self,
                                command,
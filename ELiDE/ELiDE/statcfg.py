@@ -185,24 +185,38 @@ class StatListViewConfigurator(BaseStatListView):
         return ret
 
 
+class StatScreenLayout(BoxLayout):
+    screen = ObjectProperty()
+
+
 class StatScreen(Screen):
     statlist = ObjectProperty()
     statcfg = ObjectProperty()
     toggle = ObjectProperty()
     proxy = ObjectProperty()
+    _layout = None
 
     @property
     def engine(self):
         return App.get_running_app().engine
 
+    def on_pre_enter(self, *args):
+        """Build my widgets the first time I'm about to be shown."""
+        if self._layout is not None:
+            return
+        self._layout = StatScreenLayout(screen=self)
+        self.add_widget(self._layout)
+        self.statcfg = self._layout.ids.cfg
+
     def new_stat(self):
         """Look at the key and value that the user has entered into the stat
         configurator, and set them on the currently selected
         entity.
 
         """
-        key = self.ids.newstatkey.text
-        value = self.ids.newstatval.text
+        ids = self._layout.ids
+        key = ids.newstatkey.text
+        value = ids.newstatval.text
         if not (key and value):
             # TODO implement some feedback to the effect that
             # you need to enter things
@@ -211,8 +225,8 @@ class StatScreen(Screen):
             self.proxy[key] = self.engine.unpack(value)
         except (TypeError, ValueError):
             self.proxy[key] = value
-        self.ids.newstatkey.text = ''
-        self.ids.newstatval.text = ''
+        ids.newstatkey.text = ''
+        ids.newstatval.text = ''
 
 
 Builder.load_string("""
@@ -266,42 +280,41 @@ Builder.load_string("""
         set_config: root.set_config
 <StatScreen>:
     name: 'statcfg'
-    statcfg: cfg
+<StatScreenLayout>:
+    orientation: 'vertical'
+    StatListViewConfigurator:
+        viewclass: 'ConfigListItem'
+        id: cfg
+        app: app
+        engine: root.screen.engine
+        proxy: root.screen.proxy
+        statlist: root.screen.statlist
+        size_hint_y: 0.95
+        RecycleBoxLayout:
+            default_size: None, dp(56)
+            default_size_hint: 1, None
+            size_hint_y: None
+            height: self.minimum_height
+            orientation: 'vertical'
     BoxLayout:
-        orientation: 'vertical'
-        StatListViewConfigurator:
-            viewclass: 'ConfigListItem'
-            id: cfg
-            app: app
-            engine: root.engine
-            proxy: root.proxy
-            statlist: root.statlist
-            size_hint_y: 0.95
-            RecycleBoxLayout:
-                default_size: None, dp(56)
-                default_size_hint: 1, None
-                size_hint_y: None
-                height: self.minimum_height
-                orientation: 'vertical'
-        BoxLayout:
-            orientation: 'horizontal'
-            size_hint_y: 0.05
-            TextInput:
-                id: newstatkey
-                multiline: False
-                write_tab: False
-                hint_text: 'New stat'
-            TextInput:
-                id: newstatval
-                multiline: False
-                write_tab: False
-                hint_text: 'Value'
-            Button:
-                id: newstatbut
-                text: '+'
-                on_release: root.new_stat()
-            Button:
-                id: closer
-                text: 'Close'
-                on_release: root.toggle()
+        orientation: 'horizontal'
+        size_hint_y: 0.05
+        TextInput:
+            id: newstatkey
+            multiline: False
+            write_tab: False
+            hint_text: 'New stat'
+        TextInput:
+            id: newstatval
+            multiline: False
+            write_tab: False
+            hint_text: 'Value'
+        Button:
+            id: newstatbut
+            text: '+'
+            on_release: root.screen.new_stat()
+        Button:
+            id: closer
+            text: 'Close'
+            on_release: root.screen.toggle()
 """)
@@ -9,16 +9,32 @@ from .util import idle_until, window_with_widget, ELiDEAppTest
 
 
 class GraphBoardTest(GraphicUnitTest):
-    @staticmethod
-    def test_layout_grid():
-        spots_wide = 3
-        spots_tall = 3
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # None of these tests run the app, so they can all share one
+        cls.app = ELiDEApp()
+
+    def tearDown(self, fake=False):
+        # Don't let one test's selection leak into the next. The window's
+        # children get cleared by GraphicUnitTest.tearDown
+        self.app.selection = None
+        super().tearDown(fake=fake)
+
+    def test_layout_grid(self):
+        self._test_layout_grid(3, 3)
+
+    def test_layout_grid_uneven(self):
+        for spots_wide, spots_tall in [(4, 2), (2, 5)]:
+            with self.subTest(spots_wide=spots_wide, spots_tall=spots_tall):
+                self._test_layout_grid(spots_wide, spots_tall)
+
+    def _test_layout_grid(self, spots_wide, spots_tall):
         graph = nx.grid_2d_graph(spots_wide, spots_tall)
         char = Facade(graph)
-        app = ELiDEApp()
         spotlayout = FinalLayout()
         arrowlayout = FinalLayout()
-        board = GraphBoard(app=app,
+        board = GraphBoard(app=self.app,
                            character=char,
                            spotlayout=spotlayout,
                            arrowlayout=arrowlayout)
@@ -56,14 +72,14 @@ class GraphBoardTest(GraphicUnitTest):
                 assert spot.x < board.spot[x + 1, y].x
             if y < spots_tall - 1:
                 assert spot.y < board.spot[x, y + 1].y
+        win.remove_widget(boardview)
 
-    @staticmethod
-    def test_select_arrow():
+    def test_select_arrow(self):
         char = Facade()
         char.add_place(0, _x=0.1, _y=0.1)
         char.add_place(1, _x=0.2, _y=0.1)
         char.add_portal(0, 1)
-        app = ELiDEApp()
+        app = self.app
         board = GraphBoard(app=app, character=char)
         boardview = GraphBoardView(board=board)
         win = window_with_widget(boardview)
@@ -76,11 +92,10 @@ class GraphBoardTest(GraphicUnitTest):
         motion.touch_up()
         assert app.selection == board.arrow[0][1]
 
-    @staticmethod
-    def test_select_spot():
+    def test_select_spot(self):
         char = Facade()
         char.add_place(0, _x=0.1, _y=0.1)
-        app = ELiDEApp()
+        app = self.app
         board = GraphBoard(app=app, character=char)
         boardview = GraphBoardView(board=board)
         win = window_with_widget(boardview)
@@ -92,12 +107,11 @@ class GraphBoardTest(GraphicUnitTest):
         motion.touch_up()
         assert app.selection == board.spot[0]
 
-    @staticmethod
-    def test_select_pawn():
+    def test_select_pawn(self):
         char = Facade()
         char.add_place(0, _x=0.1, _y=0.1)
         char.add_thing('that', location=0)
-        app = ELiDEApp()
+        app = self.app
         board = GraphBoard(app=app, character=char)
         boardview = GraphBoardView(board=board)
         win = window_with_widget(boardview)
@@ -109,13 +123,12 @@ class GraphBoardTest(GraphicUnitTest):
         motion.touch_up()
         assert app.selection == board.pawn['that']
 
-    @staticmethod
-    def test_pawn_relocate():
+    def test_pawn_relocate(self):
         char = Facade()
         char.add_place(0, _x=0.1, _y=0.1)
         char.add_place(1, _x=0.2, _y=0.1)
         char.add_thing('that', location=0)
-        app = ELiDEApp()
+        app = self.app
         board = GraphBoard(app=app, character=char)
         boardview = GraphBoardView(board=board)
         win = window_with_widget(boardview)
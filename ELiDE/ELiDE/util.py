@@ -16,6 +16,8 @@ from kivy.clock import Clock
 from kivy.uix.recycleview.layout import LayoutSelectionBehavior
 from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.behaviors import FocusBehavior
+import re
+from collections import defaultdict
 from functools import partial
 from math import sin, cos, atan, pi
 
@@ -83,18 +85,44 @@ def dummynum(character, name):
 
     """
     num = 0
+    name_len = len(name)
     for nodename in character.node:
         nodename = str(nodename)
         if not nodename.startswith(name):
             continue
         try:
-            nodenum = int(nodename.lstrip(name))
+            nodenum = int(nodename[name_len:])
         except ValueError:
             continue
-        num = max((nodenum, num))
+        if nodenum > num:
+            num = nodenum
     return num
 
 
+_numbered_name = re.compile(r'(.*?)(\d+)$')
+
+
+def dummynums(character):
+    """Map every name prefix in the character to its highest node number
+
+    Takes one pass over the nodes. A prefix is whatever comes before
+    the digits at the end of a node's name, so it never ends in a
+    digit itself.
+
+    """
+    nums = defaultdict(int)
+    match = _numbered_name.match
+    for nodename in character.node:
+        m = match(str(nodename))
+        if m is None:
+            continue
+        prefix, num = m.groups()
+        num = int(num)
+        if num > nums[prefix]:
+            nums[prefix] = num
+    return dict(nums)
+
+
 def get_thin_rect_vertices(ox, oy, dx, dy, r):
     """Given the starting point, ending point, and width, return a list of
     vertex coordinates at the corners of the line segment
@@ -20,20 +20,97 @@ the same name in the ``allegedb`` package. If you change anything here,
 you won't be able to use your changes until you put the generated JSON
 where LiSE will look for it, as in:
 
-``python3 sqlalchemy.py >sqlite.json``
+``python3 alchemy.py >sqlite.json``
+
+That also writes ``sqlite.msgpack``, which LiSE loads faster, if you
+have msgpack installed.
 
 """
-from collections import OrderedDict
-from functools import partial
+import os
+import sys
+from functools import lru_cache
 from sqlalchemy import Table, Column, ForeignKeyConstraint, select, bindparam, func, and_, or_, INT, TEXT, BOOLEAN
-from sqlalchemy.sql.ddl import CreateTable, CreateIndex
+from sqlalchemy.sql.ddl import CreateTable
 
 BaseColumn = Column
-Column = partial(BaseColumn, nullable=False)
 
-from json import dumps
+
+class Column(BaseColumn):
+    """A column that's ``NOT NULL`` unless you say otherwise"""
+    inherit_cache = True
+
+    def __init__(self, *args, nullable=False, **kwargs):
+        super().__init__(*args, nullable=nullable, **kwargs)
+
+
+from hashlib import sha256
+from json import JSONEncoder, load
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Same format as the committed sqlite.json, so regenerating it makes no diff
+_encoder = JSONEncoder(sort_keys=True, indent=4)
+
+
+def dump(obj, outf):
+    """Write ``obj`` as JSON to the binary file ``outf``
+
+    Return the sha256 hex digest of what got written.
+
+    """
+    h = sha256()
+    # Write it a piece at a time, rather than building one big string
+    for chunk in _encoder.iterencode(obj):
+        chunk = chunk.encode()
+        h.update(chunk)
+        outf.write(chunk)
+    outf.write(b'\n')
+    h.update(b'\n')
+    return h.hexdigest()
+
 
 from allegedb import alchemy
+from allegedb.query import QUERIES_FORMAT_VERSION
+
+
+def _rulebook_table_args():
+    """Return columns and constraints for a table of the rulebooks that
+    some kind of entity in a character follows
+
+    """
+    return (Column('character', TEXT, primary_key=True),
+            Column('branch', TEXT, primary_key=True, default='trunk'),
+            Column('turn', INT, primary_key=True, default=0),
+            Column('tick', INT, primary_key=True, default=0),
+            Column('rulebook', TEXT),
+            ForeignKeyConstraint(['character'], ['graphs.graph']),
+            ForeignKeyConstraint(['rulebook'], ['rulebooks.rulebook']))
+
+
+def _rules_handled_table_args(rulebook_table, extra_keys, *foreign_keys):
+    """Return columns and constraints for a table of the rules handled
+    in one of the character rulebook tables
+
+    ``extra_keys`` are the names of primary key columns identifying the
+    entity the rule was handled for, if that isn't the character itself.
+    ``foreign_keys`` are pairs of column lists, local and remote, to make
+    into further foreign key constraints.
+
+    """
+    return (Column('character', TEXT, primary_key=True),
+            Column('rulebook', TEXT, primary_key=True),
+            Column('rule', TEXT, primary_key=True),
+            *(Column(key, TEXT, primary_key=True) for key in extra_keys),
+            Column('branch', TEXT, primary_key=True, default='trunk'),
+            Column('turn', INT, primary_key=True),
+            Column('tick', INT),
+            ForeignKeyConstraint(['character', 'rulebook'], [
+                rulebook_table + '.character', rulebook_table + '.rulebook'
+            ]),
+            *(ForeignKeyConstraint(cols, refcols)
+              for (cols, refcols) in foreign_keys))
 
 
 def tables_for_meta(meta):
@@ -112,16 +189,7 @@ def tables_for_meta(meta):
     for name in ('character_rulebook', 'unit_rulebook',
                  'character_thing_rulebook', 'character_place_rulebook',
                  'character_portal_rulebook'):
-        Table(name,
-              meta,
-              Column('character', TEXT, primary_key=True),
-              Column('branch', TEXT, primary_key=True, default='trunk'),
-              Column('turn', INT, primary_key=True, default=0),
-              Column('tick', INT, primary_key=True, default=0),
-              Column('rulebook', TEXT),
-              ForeignKeyConstraint(['character'], ['graphs.graph']),
-              ForeignKeyConstraint(['rulebook'], ['rulebooks.rulebook']),
-              sqlite_with_rowid=False)
+        Table(name, meta, *_rulebook_table_args(), sqlite_with_rowid=False)
 
     # Rules handled within the rulebook associated with one node in
     # particular.
@@ -233,87 +301,25 @@ def tables_for_meta(meta):
                                ['nodes.graph', 'nodes.node']),
           sqlite_with_rowid=False)
 
-    crh = Table(
-        'character_rules_handled',
-        meta,
-        Column('character', TEXT, primary_key=True),
-        Column('rulebook', TEXT, primary_key=True),
-        Column('rule', TEXT, primary_key=True),
-        Column('branch', TEXT, primary_key=True, default='trunk'),
-        Column('turn', INT, primary_key=True),
-        Column('tick', INT),
-        ForeignKeyConstraint(
-            ['character', 'rulebook'],
-            ['character_rulebook.character', 'character_rulebook.rulebook']),
-        sqlite_with_rowid=False)
-
-    arh = Table('unit_rules_handled',
-                meta,
-                Column('character', TEXT, primary_key=True),
-                Column('rulebook', TEXT, primary_key=True),
-                Column('rule', TEXT, primary_key=True),
-                Column('graph', TEXT, primary_key=True),
-                Column('unit', TEXT, primary_key=True),
-                Column('branch', TEXT, primary_key=True, default='trunk'),
-                Column('turn', INT, primary_key=True),
-                Column('tick', INT),
-                ForeignKeyConstraint(
-                    ['character', 'rulebook'],
-                    ['unit_rulebook.character', 'unit_rulebook.rulebook']),
-                sqlite_with_rowid=False)
-
-    ctrh = Table('character_thing_rules_handled',
-                 meta,
-                 Column('character', TEXT, primary_key=True),
-                 Column('rulebook', TEXT, primary_key=True),
-                 Column('rule', TEXT, primary_key=True),
-                 Column('thing', TEXT, primary_key=True),
-                 Column('branch', TEXT, primary_key=True, default='trunk'),
-                 Column('turn', INT, primary_key=True),
-                 Column('tick', INT),
-                 ForeignKeyConstraint(['character', 'rulebook'], [
-                     'character_thing_rulebook.character',
-                     'character_thing_rulebook.rulebook'
-                 ]),
-                 ForeignKeyConstraint(['character', 'thing'],
-                                      ['things.character', 'things.thing']),
-                 sqlite_with_rowid=False)
-
-    cprh = Table('character_place_rules_handled',
-                 meta,
-                 Column('character', TEXT, primary_key=True),
-                 Column('rulebook', TEXT, primary_key=True),
-                 Column('rule', TEXT, primary_key=True),
-                 Column('place', TEXT, primary_key=True),
-                 Column('branch', TEXT, primary_key=True, default='trunk'),
-                 Column('turn', INT, primary_key=True),
-                 Column('tick', INT),
-                 ForeignKeyConstraint(['character', 'rulebook'], [
-                     'character_place_rulebook.character',
-                     'character_place_rulebook.rulebook'
-                 ]),
-                 ForeignKeyConstraint(['character', 'place'],
-                                      ['nodes.graph', 'nodes.node']),
-                 sqlite_with_rowid=False)
-
-    cporh = Table(
-        'character_portal_rules_handled',
-        meta,
-        Column('character', TEXT, primary_key=True),
-        Column('rulebook', TEXT, primary_key=True),
-        Column('rule', TEXT, primary_key=True),
-        Column('orig', TEXT, primary_key=True),
-        Column('dest', TEXT, primary_key=True),
-        Column('branch', TEXT, primary_key=True, default='trunk'),
-        Column('turn', INT, primary_key=True),
-        Column('tick', INT),
-        ForeignKeyConstraint(['character', 'rulebook'], [
-            'character_portal_rulebook.character',
-            'character_portal_rulebook.rulebook'
-        ]),
-        ForeignKeyConstraint(['character', 'orig', 'dest'],
-                             ['edges.graph', 'edges.orig', 'edges.dest']),
-        sqlite_with_rowid=False)
+    # Rules handled within the rulebooks of characters, and of the
+    # entities in them, as named by the extra primary key columns
+    for (name, rulebook_table, extra_keys, foreign_keys) in (
+        ('character_rules_handled', 'character_rulebook', (), ()),
+        ('unit_rules_handled', 'unit_rulebook', ('graph', 'unit'), ()),
+        ('character_thing_rules_handled', 'character_thing_rulebook',
+         ('thing', ), ((['character', 'thing'],
+                        ['things.character', 'things.thing']), )),
+        ('character_place_rules_handled', 'character_place_rulebook',
+         ('place', ), ((['character', 'place'],
+                        ['nodes.graph', 'nodes.node']), )),
+        ('character_portal_rules_handled', 'character_portal_rulebook',
+         ('orig', 'dest'), ((['character', 'orig', 'dest'],
+                             ['edges.graph', 'edges.orig', 'edges.dest']), ))):
+        Table(name,
+              meta,
+              *_rules_handled_table_args(rulebook_table, extra_keys,
+                                         *foreign_keys),
+              sqlite_with_rowid=False)
 
     Table('turns_completed',
           meta,
@@ -324,8 +330,32 @@ def tables_for_meta(meta):
     return meta.tables
 
 
-def indices_for_table_dict(table):
-    return {}
+def _after(turn, tick, turn_param, tick_param, turn_param_b=None):
+    """Return a clause that's true when ``turn`` and ``tick`` are at or
+    after the time in the parameters
+
+    If the turn parameter needs to be bound twice under different names,
+    pass the second as ``turn_param_b``.
+
+    """
+    if turn_param_b is None:
+        turn_param_b = turn_param
+    return or_(turn > turn_param,
+               and_(turn == turn_param_b, tick >= tick_param))
+
+
+def _before(turn, tick, turn_param, tick_param, turn_param_b=None):
+    """Return a clause that's true when ``turn`` and ``tick`` are at or
+    before the time in the parameters
+
+    If the turn parameter needs to be bound twice under different names,
+    pass the second as ``turn_param_b``.
+
+    """
+    if turn_param_b is None:
+        turn_param_b = turn_param
+    return or_(turn < turn_param,
+               and_(turn == turn_param_b, tick <= tick_param))
 
 
 def queries(table):
@@ -333,88 +363,82 @@ def queries(table):
     of all the rest of the queries I need.
 
     """
+    # Bound parameters with the same name are interchangeable, so only make one
+    bp = lru_cache(maxsize=None)(bindparam)
+
     def update_where(updcols, wherecols):
         """Return an ``UPDATE`` statement that updates the columns ``updcols``
         when the ``wherecols`` match. Every column has a bound parameter of
         the same name.
 
-        updcols are strings, wherecols are column objects
+        Both are lists of column objects.
 
         """
-        vmap = OrderedDict()
-        for col in updcols:
-            vmap[col] = bindparam(col)
-        wheres = [c == bindparam(c.name) for c in wherecols]
+        vmap = {c.name: bp(c.name) for c in updcols}
+        wheres = [c == bp(c.name) for c in wherecols]
         tab = wherecols[0].table
         return tab.update().values(**vmap).where(and_(*wheres))
 
     r = alchemy.queries_for_table_dict(table)
 
     rulebooks = table['rulebooks']
-    r['rulebooks_update'] = update_where(['rules'], [
+    r['rulebooks_update'] = update_where([rulebooks.c.rules], [
         rulebooks.c.rulebook, rulebooks.c.branch, rulebooks.c.turn,
         rulebooks.c.tick
     ])
 
+    time_cols = frozenset(('branch', 'turn', 'tick'))
     for t in table.values():
+        cols = list(t.c.values())
+        cnames = [c.name for c in cols]
         key = list(t.primary_key)
-        if 'branch' in t.columns and 'turn' in t.columns and 'tick' in t.columns:
-            branch = t.columns['branch']
-            turn = t.columns['turn']
-            tick = t.columns['tick']
-            if branch in key and turn in key and tick in key:
-                key = [branch, turn, tick]
-        r[t.name + '_dump'] = select(list(t.c.values())).order_by(*key)
+        # Primary key columns are a subset of all the columns, so there's
+        # no need to check the rest
+        if time_cols <= frozenset(c.name for c in key):
+            key = [t.c.branch, t.c.turn, t.c.tick]
+        r[t.name + '_dump'] = select(*cols).order_by(*key)
         r[t.name + '_insert'] = t.insert().values(
-            tuple(bindparam(cname) for cname in t.c.keys()))
-        r[t.name + '_count'] = select([func.COUNT('*')]).select_from(t)
-
-    r['del_char_things'] = table['things'].delete().where(
-        table['things'].c.character == bindparam('character'))
+            tuple(bp(cname) for cname in cnames))
+        r[t.name + '_count'] = select(func.count()).select_from(t)
 
-    r['del_char_units'] = table['units'].delete().where(
-        table['units'].c.character_graph == bindparam('character'))
     things = table['things']
+    character, thing, branch, turn, tick, location = (
+        things.c.character, things.c.thing, things.c.branch, things.c.turn,
+        things.c.tick, things.c.location)
+    r['del_char_things'] = things.delete().where(
+        character == bp('character'))
     r['del_things_after'] = things.delete().where(
         and_(
-            things.c.character == bindparam('character'),
-            things.c.thing == bindparam('thing'),
-            things.c.branch == bindparam('branch'),
-            or_(
-                things.c.turn > bindparam('turn'),
-                and_(things.c.turn == bindparam('turn'),
-                     things.c.tick >= bindparam('tick')))))
-    units = table['units']
-    r['del_units_after'] = units.delete().where(
-        and_(
-            units.c.character_graph == bindparam('character'),
-            units.c.unit_graph == bindparam('graph'),
-            units.c.unit_node == bindparam('unit'),
-            units.c.branch == bindparam('branch'),
-            or_(
-                units.c.turn > bindparam('turn'),
-                and_(units.c.turn == bindparam('turn'),
-                     units.c.tick >= bindparam('tick')))))
+            character == bp('character'), thing == bp('thing'),
+            branch == bp('branch'),
+            _after(turn, tick, bp('turn'), bp('tick'))))
     things_to_end_clause = and_(
-        things.c.character == bindparam('character'),
-        things.c.branch == bindparam('branch'),
-        or_(
-            things.c.turn > bindparam('turn_from_a'),
-            and_(things.c.turn == bindparam('turn_from_b'),
-                 things.c.tick >= bindparam('tick_from'))))
+        character == bp('character'), branch == bp('branch'),
+        _after(turn, tick, bp('turn_from_a'), bp('tick_from'),
+               bp('turn_from_b')))
     r['load_things_tick_to_end'] = select(
-        [things.c.thing, things.c.turn, things.c.tick,
-         things.c.location]).where(things_to_end_clause)
+        thing, turn, tick, location).where(things_to_end_clause)
     r['load_things_tick_to_tick'] = select(
-        [things.c.thing, things.c.turn, things.c.tick,
-         things.c.location]).where(
-             and_(
-                 things_to_end_clause,
-                 or_(
-                     things.c.turn < bindparam('turn_to_a'),
-                     and_(things.c.turn == bindparam('turn_to_b'),
-                          things.c.tick <= bindparam('tick_to')))))
+        thing, turn, tick, location).where(
+            and_(
+                things_to_end_clause,
+                _before(turn, tick, bp('turn_to_a'), bp('tick_to'),
+                        bp('turn_to_b'))))
 
+    units = table['units']
+    character_graph, unit_graph, unit_node, branch, turn, tick = (
+        units.c.character_graph, units.c.unit_graph, units.c.unit_node,
+        units.c.branch, units.c.turn, units.c.tick)
+    r['del_char_units'] = units.delete().where(
+        character_graph == bp('character'))
+    r['del_units_after'] = units.delete().where(
+        and_(
+            character_graph == bp('character'), unit_graph == bp('graph'),
+            unit_node == bp('unit'), branch == bp('branch'),
+            _after(turn, tick, bp('turn'), bp('tick'))))
+
+    b_branch = bp('branch')
+    b_turn = bp('turn')
     for handledtab in ('character_rules_handled', 'unit_rules_handled',
                        'character_thing_rules_handled',
                        'character_place_rules_handled',
@@ -422,33 +446,123 @@ def queries(table):
                        'portal_rules_handled'):
         ht = table[handledtab]
         r['del_{}_turn'.format(handledtab)] = ht.delete().where(
-            and_(ht.c.branch == bindparam('branch'),
-                 ht.c.turn == bindparam('turn')))
+            and_(ht.c.branch == b_branch, ht.c.turn == b_turn))
 
     branches = table['branches']
 
     r['branch_children'] = select(
-        [branches.c.branch]).where(branches.c.parent == bindparam('branch'))
+        branches.c.branch).where(branches.c.parent == bp('branch'))
 
     tc = table['turns_completed']
-    r['turns_completed_update'] = update_where(['turn'], [tc.c.branch])
+    r['turns_completed_update'] = update_where([tc.c.turn], [tc.c.branch])
 
     return r
 
 
-if __name__ == '__main__':
+def build():
+    """Compile all the SQL for sqlite and return it in a dictionary"""
     from sqlalchemy import MetaData
     from sqlalchemy.dialects.sqlite.pysqlite import SQLiteDialect_pysqlite
     meta = MetaData()
     r = {}
     table = tables_for_meta(meta)
     dia = SQLiteDialect_pysqlite()
+    # Instantiate the dialect's compilers directly, which is all that
+    # ``compile(dialect=dia)`` would do after resolving its arguments
+    ddl_compiler = dia.ddl_compiler
+    statement_compiler = dia.statement_compiler
     for (n, t) in table.items():
-        r["create_" + n] = str(CreateTable(t).compile(dialect=dia))
-    index = indices_for_table_dict(table)
-    for (n, x) in index.items():
-        r["index_" + n] = str(CreateIndex(x).compile(dialect=dia))
+        r["create_" + n] = str(ddl_compiler(dia, CreateTable(t)))
+    # LiSE defines no indices, and neither does allegedb, so there are
+    # no CREATE INDEX statements to compile
     query = queries(table)
     for (n, q) in query.items():
-        r[n] = str(q.compile(dialect=dia))
-    print(dumps(r, sort_keys=True, indent=4))
+        r[n] = str(statement_compiler(dia, q))
+    return r
+
+
+def write_msgpack(r, json_sha256):
+    """Write the compiled SQL to ``sqlite.msgpack`` next to this script
+
+    ``json_sha256`` is the hex digest of the JSON that goes in
+    ``sqlite.json``. It's stored alongside the queries, and LiSE only loads ``sqlite.msgpack``
+    in preference to ``sqlite.json`` when the hash still matches. Does
+    nothing if msgpack isn't installed.
+
+    The queries are stored as a sorted array of name-and-SQL pairs, under
+    the ``'queries'`` key of a map with the format version in ``'v'``.
+    msgpack unpacks that, and makes it a dict, quicker than it unpacks
+    a map of the same size.
+
+    """
+    if msgpack is None:
+        return
+    fn = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      'sqlite.msgpack')
+    with open(fn, 'wb') as outf:
+        outf.write(
+            msgpack.packb({
+                'v': QUERIES_FORMAT_VERSION,
+                'json_sha256': json_sha256,
+                'queries': sorted(r.items())
+            }))
+
+
+def _cache_key():
+    """Return a hex digest of everything that goes into ``build()``'s output
+
+    That's the source of this script and of ``allegedb``'s alchemy
+    module, the version of sqlalchemy, the dialect, and the format
+    version of ``sqlite.msgpack``.
+
+    """
+    import sqlalchemy
+    h = sha256()
+    for fn in (__file__, alchemy.__file__):
+        with open(fn, 'rb') as inf:
+            h.update(inf.read())
+    h.update('\0'.join(
+        (sqlalchemy.__version__, 'sqlite+pysqlite',
+         str(QUERIES_FORMAT_VERSION))).encode())
+    return h.hexdigest()
+
+
+def main():
+    """Print the JSON for sqlite, compiling it only if its inputs changed
+
+    The output is cached in ``~/.cache/LiSE``, keyed by ``_cache_key()``.
+    That covers the Python sources and the sqlalchemy version, but not
+    anything else in the environment, so delete the cache if you get
+    strange output. The same SQL gets written to ``sqlite.msgpack``.
+
+    """
+    digest = _cache_key()
+    cachedir = os.path.join(os.path.expanduser('~'), '.cache', 'LiSE')
+    cachefn = os.path.join(cachedir, 'alchemy-{}.json'.format(digest))
+    if os.path.exists(cachefn):
+        with open(cachefn, 'rb') as inf:
+            h = sha256()
+            while True:
+                block = inf.read(65536)
+                if not block:
+                    break
+                h.update(block)
+                sys.stdout.buffer.write(block)
+            inf.seek(0)
+            write_msgpack(load(inf), h.hexdigest())
+        return
+    r = build()
+    try:
+        os.makedirs(cachedir, exist_ok=True)
+        # Write somewhere else first, so nobody reads a partial file
+        tmpfn = '{}.{}.tmp'.format(cachefn, os.getpid())
+        with open(tmpfn, 'wb') as outf:
+            dump(r, outf)
+        os.replace(tmpfn, cachefn)
+    except OSError:
+        pass
+    write_msgpack(r, dump(r, sys.stdout.buffer))
+
+
+if __name__ == '__main__':
+    main()
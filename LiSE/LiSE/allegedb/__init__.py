@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """The main interface to the allegedb ORM, and some supporting functions and classes"""
+from bisect import bisect_left, bisect_right, insort
 from contextlib import ContextDecorator, contextmanager
 import gc
 from weakref import WeakValueDictionary
@@ -20,19 +21,26 @@ from weakref import WeakValueDictionary
 from blinker import Signal
 import networkx as nx
 
-from .window import update_window, update_backward_window
+from .window import iter_window, iter_backward_window
 from .cache import HistoryError
 from .graph import (DiGraph, Node, Edge, GraphsMapping)
 from .query import QueryEngine, TimeError
 from .window import HistoryError
 
 
-def loaded_keep_test(test_turn, test_tick, past_turn, past_tick, future_turn,
-                     future_tick):
-    return (past_turn < test_turn or
-            (past_turn == test_turn and past_tick <= test_tick)) and (
-                future_turn > test_turn or
-                (future_turn == test_turn and future_tick >= test_tick))
+def _extend_to_latest(rows, new_rows, i, latest):
+    """Append ``new_rows`` to ``rows``, and return the latest
+    ``(turn, tick)`` among them and ``latest``
+
+    ``i`` is the index of the turn in each row. The tick follows it.
+
+    """
+    j = i + 2
+    for row in new_rows:
+        rows.append(row)
+        if row[i:j] > latest:
+            latest = row[i:j]
+    return latest
 
 
 class GraphNameError(KeyError):
@@ -93,6 +101,8 @@ class TimeSignal:
     or turn changes, pass it to my ``connect`` method.
 
     """
+    __slots__ = ('engine', 'branch', 'turn', 'sig', '__weakref__')
+
     def __init__(self, engine, sig):
         self.engine = engine
         self.branch = self.engine.branch
@@ -107,11 +117,11 @@ class TimeSignal:
         return 2
 
     def __getitem__(self, i):
-        if i in ('branch', 0):
+        if i == 0 or i == 'branch':
             return self.branch
-        if i in ('turn', 1):
+        if i == 1 or i == 'turn':
             return self.turn
-        raise IndexError
+        raise IndexError(i)
 
     def connect(self, *args, **kwargs):
         self.sig.connect(*args, **kwargs)
@@ -141,22 +151,29 @@ class TimeSignal:
         return tuple(self) <= other
 
 
+def _time_signal(inst):
+    """Return the ``Signal`` for when ``inst``'s time changes"""
+    # Kept in the instance's own dict, so it goes away along with it
+    instdict = inst.__dict__
+    sig = instdict.get('_time_signal')
+    if sig is None:
+        sig = instdict['_time_signal'] = Signal()
+    return sig
+
+
 class TimeSignalDescriptor:
     __doc__ = TimeSignal.__doc__
-    signals = {}
 
     def __get__(self, inst, cls):
-        if id(inst) not in self.signals:
-            self.signals[id(inst)] = Signal()
-        return TimeSignal(inst, self.signals[id(inst)])
+        if inst is None:
+            return self
+        return TimeSignal(inst, _time_signal(inst))
 
     def __set__(self, inst, val):
-        if id(inst) not in self.signals:
-            self.signals[id(inst)] = Signal()
-        sig = self.signals[id(inst)]
+        sig = _time_signal(inst)
         branch_then, turn_then, tick_then = inst._btt()
         branch_now, turn_now = val
-        if (branch_then, turn_then) == (branch_now, turn_now):
+        if branch_then == branch_now and turn_then == turn_now:
             return
         e = inst
         # enforce the arrow of time, if it's in effect
@@ -212,57 +229,18 @@ class TimeSignalDescriptor:
                  tick_now=tick_now)
 
 
-def setgraphval(delta, graph, key, val):
-    """Change a delta to say that a graph stat was set to a certain value"""
-    delta.setdefault(graph, {})[key] = val
-
-
-def setnode(delta, graph, node, exists):
-    """Change a delta to say that a node was created or deleted"""
-    delta.setdefault(graph, {}).setdefault('nodes', {})[node] = bool(exists)
-
-
-def setnodeval(delta, graph, node, key, value):
-    """Change a delta to say that a node stat was set to a certain value"""
-    if (graph in delta and 'nodes' in delta[graph]
-            and node in delta[graph]['nodes']
-            and not delta[graph]['nodes'][node]):
-        return
-    delta.setdefault(graph, {}).setdefault('node_val',
-                                           {}).setdefault(node,
-                                                          {})[key] = value
-
-
-def setedge(delta, is_multigraph, graph, orig, dest, idx, exists):
-    """Change a delta to say that an edge was created or deleted"""
-    if is_multigraph(graph):
-        delta.setdefault(graph, {}).setdefault('edges', {})\
-            .setdefault(orig, {}).setdefault(dest, {})[idx] = bool(exists)
-    else:
-        delta.setdefault(graph, {}).setdefault('edges', {})\
-            .setdefault(orig, {})[dest] = bool(exists)
-
-
-def setedgeval(delta, is_multigraph, graph, orig, dest, idx, key, value):
-    """Change a delta to say that an edge stat was set to a certain value"""
-    if is_multigraph(graph):
-        if (graph in delta and 'edges' in delta[graph]
-                and orig in delta[graph]['edges']
-                and dest in delta[graph]['edges'][orig]
-                and idx in delta[graph]['edges'][orig][dest]
-                and not delta[graph]['edges'][orig][dest][idx]):
-            return
-        delta.setdefault(graph, {}).setdefault('edge_val', {})\
-            .setdefault(orig, {}).setdefault(dest, {})\
-            .setdefault(idx, {})[key] = value
-    else:
-        if (graph in delta and 'edges' in delta[graph]
-                and orig in delta[graph]['edges']
-                and dest in delta[graph]['edges'][orig]
-                and not delta[graph]['edges'][orig][dest]):
-            return
-        delta.setdefault(graph, {}).setdefault('edge_val', {})\
-            .setdefault(orig, {}).setdefault(dest, {})[key] = value
+def _merge_graph_deltas(delta, nodes_deltas, node_val_deltas, edges_deltas,
+                        edge_val_deltas):
+    """Put per-graph dicts of node and edge changes into ``delta``"""
+    for kind, graph_deltas in (('nodes', nodes_deltas),
+                               ('node_val', node_val_deltas),
+                               ('edges', edges_deltas),
+                               ('edge_val', edge_val_deltas)):
+        for graph, graph_delta in graph_deltas.items():
+            if graph in delta:
+                delta[graph][kind] = graph_delta
+            else:
+                delta[graph] = {kind: graph_delta}
 
 
 class ORM(object):
@@ -280,49 +258,54 @@ class ORM(object):
 
     def _graph_state_hash(self, nodes, edges, vals):
         from hashlib import blake2b
-        qpac = self.query.pack
-
-        if isinstance(qpac(' '), str):
-
-            def pack(x):
-                return qpac(x).encode()
-        else:
-            pack = qpac
-        nodes_hash = 0
+        pack = self._pack_bytes
+        # Prefix each packed field with its length, so that records can't
+        # run together. Sorting the records makes the hash the same no
+        # matter what order the dicts were built in.
+        node_records = []
+        append = node_records.append
         for name, val in nodes.items():
-            hash = blake2b(pack(name))
-            hash.update(pack(val))
-            nodes_hash ^= int.from_bytes(hash.digest(), 'little')
-        edges_hash = 0
+            name = pack(name)
+            val = pack(val)
+            append(
+                len(name).to_bytes(4, 'little') + name +
+                len(val).to_bytes(4, 'little') + val)
+        node_records.sort()
+        nodes_hash = blake2b(b''.join(node_records)).digest()
+        edge_records = []
+        append = edge_records.append
         for orig, dests in edges.items():
+            orig = pack(orig)
+            orig = len(orig).to_bytes(4, 'little') + orig
             for dest, idxs in dests.items():
+                dest = pack(dest)
+                dest = len(dest).to_bytes(4, 'little') + dest
                 for idx, val in idxs.items():
-                    hash = blake2b(pack(orig))
-                    hash.update(pack(dest))
-                    hash.update(pack(idx))
-                    hash.update(pack(val))
-                    edges_hash ^= int.from_bytes(hash.digest(), 'little')
-        val_hash = 0
+                    idx = pack(idx)
+                    val = pack(val)
+                    append(orig + dest + len(idx).to_bytes(4, 'little') +
+                           idx + len(val).to_bytes(4, 'little') + val)
+        edge_records.sort()
+        edges_hash = blake2b(b''.join(edge_records)).digest()
+        val_records = []
+        append = val_records.append
         for key, val in vals.items():
-            hash = blake2b(pack(key))
-            hash.update(pack(val))
-            val_hash ^= int.from_bytes(hash.digest(), 'little')
-        total_hash = blake2b(nodes_hash.to_bytes(64, 'little'))
-        total_hash.update(edges_hash.to_bytes(64, 'little'))
-        total_hash.update(val_hash.to_bytes(64, 'little'))
+            key = pack(key)
+            val = pack(val)
+            append(
+                len(key).to_bytes(4, 'little') + key +
+                len(val).to_bytes(4, 'little') + val)
+        val_records.sort()
+        val_hash = blake2b(b''.join(val_records)).digest()
+        total_hash = blake2b(nodes_hash)
+        total_hash.update(edges_hash)
+        total_hash.update(val_hash)
         return total_hash.digest()
 
     def _kfhash(self, graphn, branch, turn, tick, nodes, edges, vals):
         """Return a hash digest of a keyframe"""
         from hashlib import blake2b
-        qpac = self.query.pack
-
-        if isinstance(qpac(' '), str):
-
-            def pack(x):
-                return qpac(x).encode()
-        else:
-            pack = qpac
+        pack = self._pack_bytes
         total_hash = blake2b(pack(graphn))
         total_hash.update(pack(branch))
         total_hash.update(pack(turn))
@@ -334,43 +317,59 @@ class ORM(object):
         return self.node_cls(graph, node)
 
     def _get_node(self, graph, node):
+        if isinstance(graph, str):
+            return self._get_node_by_name(graph, node)
+        return self._get_node_by_name(graph.name, node, graph)
+
+    def _get_node_by_name(self, graphn, node, graph=None):
+        """Get a node object, given the name of its graph
+
+        Pass the graph object too, if you have it, to save looking it up.
+
+        """
         node_objs, node_exists, make_node = self._get_node_stuff
-        if type(graph) is str:
-            graphn = graph
-            graph = self.graph[graphn]
-        else:
-            graphn = graph.name
-        key = (graphn, node)
-        if key in node_objs:
-            ret = node_objs[key]
+        graph_node_objs = node_objs[graphn]
+        ret = graph_node_objs.get(node)
+        if ret is not None:
             if ret._validate_node_type():
                 return ret
             else:
-                del node_objs[key]
+                del graph_node_objs[node]
         if not node_exists(graphn, node):
             raise KeyError("No such node: {} in {}".format(node, graphn))
+        if graph is None:
+            graph = self.graph[graphn]
         ret = make_node(graph, node)
-        node_objs[key] = ret
+        graph_node_objs[node] = ret
         return ret
 
     def _make_edge(self, graph, orig, dest, idx):
         return self.edge_cls(graph, orig, dest, idx)
 
     def _get_edge(self, graph, orig, dest, idx=0):
+        if isinstance(graph, str):
+            return self._get_edge_by_name(graph, orig, dest, idx)
+        return self._get_edge_by_name(graph.name, orig, dest, idx, graph)
+
+    def _get_edge_by_name(self, graphn, orig, dest, idx=0, graph=None):
+        """Get an edge object, given the name of its graph
+
+        Pass the graph object too, if you have it, to save looking it up.
+
+        """
         edge_objs, edge_exists, make_edge = self._get_edge_stuff
-        if type(graph) is str:
-            graphn = graph
-            graph = self.graph[graphn]
-        else:
-            graphn = graph.name
-        key = (graphn, orig, dest, idx)
-        if key in edge_objs:
-            return edge_objs[key]
+        graph_edge_objs = edge_objs[graphn]
+        key = (orig, dest, idx)
+        ret = graph_edge_objs.get(key)
+        if ret is not None:
+            return ret
         if not edge_exists(graphn, orig, dest, idx):
             raise KeyError("No such edge: {}->{}[{}] in {}".format(
                 orig, dest, idx, graphn))
+        if graph is None:
+            graph = self.graph[graphn]
         ret = make_edge(graph, orig, dest, idx)
-        edge_objs[key] = ret
+        graph_edge_objs[key] = ret
         return ret
 
     def plan(self):
@@ -427,10 +426,9 @@ class ORM(object):
         if turn_from == turn_to:
             return self.get_turn_delta(branch, turn_from, tick_from, tick_to)
         delta = {}
-        graph_objs = self._graph_objs
         if turn_to < turn_from:
-            updater = partial(update_backward_window, turn_from, tick_from,
-                              turn_to, tick_to)
+            window = partial(iter_backward_window, turn_from, tick_from,
+                             turn_to, tick_to)
             gvbranches = self._graph_val_cache.presettings
             nbranches = self._nodes_cache.presettings
             nvbranches = self._node_val_cache.presettings
@@ -438,8 +436,8 @@ class ORM(object):
             evbranches = self._edge_val_cache.presettings
             tick_to += 1
         else:
-            updater = partial(update_window, turn_from, tick_from, turn_to,
-                              tick_to)
+            window = partial(iter_window, turn_from, tick_from, turn_to,
+                             tick_to)
             gvbranches = self._graph_val_cache.settings
             nbranches = self._nodes_cache.settings
             nvbranches = self._node_val_cache.settings
@@ -447,26 +445,95 @@ class ORM(object):
             evbranches = self._edge_val_cache.settings
 
         if branch in gvbranches:
-            updater(partial(setgraphval, delta), gvbranches[branch])
+            for graph, key, value in window(gvbranches[branch]):
+                if graph in delta:
+                    delta[graph][key] = value
+                else:
+                    delta[graph] = {key: value}
 
+        nodes_deltas = {}
         if branch in nbranches:
-            updater(partial(setnode, delta), nbranches[branch])
+            for graph, node, exists in window(nbranches[branch]):
+                if graph in nodes_deltas:
+                    nodes_deltas[graph][node] = bool(exists)
+                else:
+                    nodes_deltas[graph] = {node: bool(exists)}
 
+        node_val_deltas = {}
         if branch in nvbranches:
-            updater(partial(setnodeval, delta), nvbranches[branch])
+            for graph, node, key, value in window(nvbranches[branch]):
+                nodesd = nodes_deltas.get(graph)
+                if nodesd is not None and not nodesd.get(node, True):
+                    continue
+                if graph not in node_val_deltas:
+                    node_val_deltas[graph] = {node: {key: value}}
+                    continue
+                nodevd = node_val_deltas[graph]
+                if node in nodevd:
+                    nodevd[node][key] = value
+                else:
+                    nodevd[node] = {key: value}
 
+        multigraph = {
+            graph: graph_obj.is_multigraph()
+            for (graph, graph_obj) in self._graph_objs.items()
+        }
+        edges_deltas = {}
         if branch in ebranches:
-            updater(
-                partial(setedge, delta,
-                        lambda g: graph_objs[g].is_multigraph()),
-                ebranches[branch])
+            for graph, orig, dest, idx, exists in window(ebranches[branch]):
+                is_multigraph = multigraph[graph]
+                if graph in edges_deltas:
+                    edgesd = edges_deltas[graph]
+                else:
+                    edgesd = edges_deltas[graph] = {}
+                if orig in edgesd:
+                    origd = edgesd[orig]
+                else:
+                    origd = edgesd[orig] = {}
+                if not is_multigraph:
+                    origd[dest] = bool(exists)
+                elif dest in origd:
+                    origd[dest][idx] = bool(exists)
+                else:
+                    origd[dest] = {idx: bool(exists)}
 
+        edge_val_deltas = {}
         if branch in evbranches:
-            updater(
-                partial(setedgeval, delta,
-                        lambda g: graph_objs[g].is_multigraph()),
-                evbranches[branch])
+            for graph, orig, dest, idx, key, value in window(
+                    evbranches[branch]):
+                is_multigraph = multigraph[graph]
+                edgesd = edges_deltas.get(graph)
+                if (edgesd is not None and orig in edgesd
+                        and dest in edgesd[orig]):
+                    # Don't bother with stats of deleted edges
+                    extant = edgesd[orig][dest]
+                    if is_multigraph:
+                        if not extant.get(idx, True):
+                            continue
+                    elif not extant:
+                        continue
+                if graph in edge_val_deltas:
+                    edgevd = edge_val_deltas[graph]
+                else:
+                    edgevd = edge_val_deltas[graph] = {}
+                if orig in edgevd:
+                    origd = edgevd[orig]
+                else:
+                    origd = edgevd[orig] = {}
+                if dest in origd:
+                    destd = origd[dest]
+                else:
+                    destd = origd[dest] = {}
+                if is_multigraph:
+                    if idx in destd:
+                        destd[idx][key] = value
+                    else:
+                        destd[idx] = {key: value}
+                else:
+                    destd[key] = value
 
+        _merge_graph_deltas(delta, nodes_deltas, node_val_deltas, edges_deltas,
+                            edge_val_deltas)
         return delta
 
     def get_turn_delta(self,
@@ -516,69 +583,104 @@ class ORM(object):
                 else:
                     delta[graph] = {key: value}
 
+        # Collect each kind of change into its own dict of graphs, so
+        # that each record needs only one lookup to find where it goes.
+        # They're all put into the delta at the end.
+        nodes_deltas = {}
         if branch in nbranches and turn in nbranches[branch]:
             for graph, node, exists in nbranches[branch][turn][
                     tick_from:tick_to]:
-                delta.setdefault(graph, {}).setdefault('nodes',
-                                                       {})[node] = bool(exists)
+                if graph in nodes_deltas:
+                    nodes_deltas[graph][node] = bool(exists)
+                else:
+                    nodes_deltas[graph] = {node: bool(exists)}
 
+        node_val_deltas = {}
         if branch in nvbranches and turn in nvbranches[branch]:
             for graph, node, key, value in nvbranches[branch][turn][
                     tick_from:tick_to]:
-                if (graph in delta and 'nodes' in delta[graph]
-                        and node in delta[graph]['nodes']
-                        and not delta[graph]['nodes'][node]):
+                nodesd = nodes_deltas.get(graph)
+                if nodesd is not None and not nodesd.get(node, True):
+                    continue
+                if graph not in node_val_deltas:
+                    node_val_deltas[graph] = {node: {key: value}}
                     continue
-                nodevd = delta.setdefault(graph, {}).setdefault('node_val', {})
+                nodevd = node_val_deltas[graph]
                 if node in nodevd:
                     nodevd[node][key] = value
                 else:
                     nodevd[node] = {key: value}
 
-        graph_objs = self._graph_objs
+        multigraph = {
+            graph: graph_obj.is_multigraph()
+            for (graph, graph_obj) in self._graph_objs.items()
+        }
+        edges_deltas = {}
         if branch in ebranches and turn in ebranches[branch]:
             for graph, orig, dest, idx, exists in ebranches[branch][turn][
                     tick_from:tick_to]:
-                if graph_objs[graph].is_multigraph():
-                    if (graph in delta and 'edges' in delta[graph]
-                            and orig in delta[graph]['edges']
-                            and dest in delta[graph]['edges'][orig]
-                            and idx in delta[graph]['edges'][orig][dest]
-                            and not delta[graph]['edges'][orig][dest][idx]):
-                        continue
-                    delta.setdefault(graph, {}).setdefault('edges', {})\
-                        .setdefault(orig, {}).setdefault(dest, {})[idx] = bool(exists)
+                is_multigraph = multigraph[graph]
+                if graph in edges_deltas:
+                    edgesd = edges_deltas[graph]
+                else:
+                    edgesd = edges_deltas[graph] = {}
+                if orig in edgesd:
+                    origd = edgesd[orig]
+                else:
+                    origd = edgesd[orig] = {}
+                if is_multigraph:
+                    if dest in origd:
+                        destd = origd[dest]
+                        if idx in destd and not destd[idx]:
+                            continue
+                    else:
+                        destd = origd[dest] = {}
+                    destd[idx] = bool(exists)
                 else:
-                    if (graph in delta and 'edges' in delta[graph]
-                            and orig in delta[graph]['edges']
-                            and dest in delta[graph]['edges'][orig]
-                            and not delta[graph]['edges'][orig][dest]):
+                    if dest in origd and not origd[dest]:
                         continue
-                    delta.setdefault(graph, {}).setdefault('edges', {})\
-                        .setdefault(orig, {})[dest] = bool(exists)
+                    origd[dest] = bool(exists)
 
+        edge_val_deltas = {}
         if branch in evbranches and turn in evbranches[branch]:
             for graph, orig, dest, idx, key, value in evbranches[branch][turn][
                     tick_from:tick_to]:
-                edgevd = delta.setdefault(graph, {}).setdefault('edge_val', {})\
-                    .setdefault(orig, {}).setdefault(dest, {})
-                if graph_objs[graph].is_multigraph():
-                    if idx in edgevd:
-                        edgevd[idx][key] = value
+                if graph in edge_val_deltas:
+                    edgevd = edge_val_deltas[graph]
+                else:
+                    edgevd = edge_val_deltas[graph] = {}
+                is_multigraph = multigraph[graph]
+                if orig in edgevd:
+                    origd = edgevd[orig]
+                else:
+                    origd = edgevd[orig] = {}
+                if dest in origd:
+                    destd = origd[dest]
+                else:
+                    destd = origd[dest] = {}
+                if is_multigraph:
+                    if idx in destd:
+                        destd[idx][key] = value
                     else:
-                        edgevd[idx] = {key: value}
+                        destd[idx] = {key: value}
                 else:
-                    edgevd[key] = value
+                    destd[key] = value
 
+        _merge_graph_deltas(delta, nodes_deltas, node_val_deltas, edges_deltas,
+                            edge_val_deltas)
         return delta
 
     def _init_caches(self):
-        from collections import defaultdict
+        from collections import defaultdict, deque
+        from functools import partial
         from .cache import Cache, NodesCache, EdgesCache
         self._where_cached = defaultdict(list)
-        self._node_objs = node_objs = WeakValueDictionary()
+        self._node_objs = node_objs = defaultdict(WeakValueDictionary)
+        """Node objects, keyed first by graph name, then by node name"""
         self._get_node_stuff = (node_objs, self._node_exists, self._make_node)
-        self._edge_objs = edge_objs = WeakValueDictionary()
+        self._edge_objs = edge_objs = defaultdict(WeakValueDictionary)
+        """Edge objects, keyed first by graph name, then by
+        ``(orig, dest, idx)``"""
         self._get_edge_stuff = (edge_objs, self._edge_exists, self._make_edge)
         self._childbranch = defaultdict(set)
         """Immediate children of a branch"""
@@ -586,17 +688,18 @@ class ORM(object):
         """Start time, end time, and parent of each branch"""
         self._branch_parents = defaultdict(set)
         """Parents of a branch at any remove"""
-        self._turn_end = defaultdict(lambda: 0)
+        self._turn_end = defaultdict(int)
         """Tick on which a (branch, turn) ends"""
-        self._turn_end_plan = defaultdict(lambda: 0)
+        self._turn_end_plan = defaultdict(int)
         """Tick on which a (branch, turn) ends, even if it hasn't been simulated"""
         self._graph_objs = {}
         self._plans = {}
         self._branches_plans = defaultdict(set)
-        self._plan_ticks = defaultdict(lambda: defaultdict(list))
+        self._plan_ticks = defaultdict(partial(defaultdict, list))
+        """Ticks in each plan, keyed by plan ID, then turn"""
         self._time_plan = {}
-        self._plans_uncommitted = []
-        self._plan_ticks_uncommitted = []
+        self._plans_uncommitted = deque()
+        self._plan_ticks_uncommitted = deque()
         self._graph_val_cache = Cache(self)
         self._graph_val_cache.name = 'graph_val_cache'
         self._nodes_cache = NodesCache(self)
@@ -631,6 +734,7 @@ class ORM(object):
         connection.
 
         """
+        from collections import defaultdict
         connect_args = connect_args or {}
         self._planning = False
         self._forward = False
@@ -645,6 +749,15 @@ class ORM(object):
             self.query = self.query_engine_cls(dbstring, connect_args, alchemy,
                                                getattr(self, 'pack', None),
                                                getattr(self, 'unpack', None))
+        qpac = self.query.pack
+        if isinstance(qpac(' '), str):
+
+            def pack_bytes(x):
+                return qpac(x).encode()
+
+            self._pack_bytes = pack_bytes
+        else:
+            self._pack_bytes = qpac
         self._edge_val_cache.setdb = self.query.edge_val_set
         self._edge_val_cache.deldb = self.query.edge_val_del_time
         self._node_val_cache.setdb = self.query.node_val_set
@@ -663,10 +776,16 @@ class ORM(object):
              end_tick) in self.query.all_branches():
             self._branches[branch] = (parent, parent_turn, parent_tick,
                                       end_turn, end_tick)
+        # Only once every branch is known, so that each can find all
+        # its ancestors
+        for branch, (parent, _, _, _, _) in self._branches.items():
             self._upd_branch_parentage(parent, branch)
-        for (branch, turn, end_tick, plan_end_tick) in self.query.turns_dump():
-            self._turn_end[branch, turn] = end_tick
-            self._turn_end_plan[branch, turn] = plan_end_tick
+        turns = list(self.query.turns_dump())
+        self._turn_end.update(((branch, turn), end_tick)
+                              for (branch, turn, end_tick, _) in turns)
+        self._turn_end_plan.update(
+            ((branch, turn), plan_end_tick)
+            for (branch, turn, _, plan_end_tick) in turns)
         if 'trunk' not in self._branches:
             self._branches['trunk'] = None, 0, 0, 0, 0
         self._new_keyframes = []
@@ -682,26 +801,20 @@ class ORM(object):
         self._load_graphs()
         assert hasattr(self, 'graph')
         self._keyframes_list = []
-        self._keyframes_dict = {}
         self._keyframes_times = set()
-        self._loaded = {}  # branch: (turn_from, tick_from, turn_to, tick_to)
+        self._keyframes_by_branch = defaultdict(list)
+        """Sorted ``(turn, tick)`` of keyframes in each branch"""
+        self._loaded = {}
+        """``((turn_from, tick_from), (turn_to, tick_to))`` of the time
+        loaded in each branch"""
         self._init_load()
 
     def _init_load(self):
         keyframes_list = self._keyframes_list
-        keyframes_dict = self._keyframes_dict
-        keyframes_times = self._keyframes_times
+        add_keyframe_time = self._add_keyframe_time
         for graph, branch, turn, tick in self.query.keyframes_list():
             keyframes_list.append((graph, branch, turn, tick))
-            if branch not in keyframes_dict:
-                keyframes_dict[branch] = {turn: {tick}}
-            else:
-                keyframes_dict_branch = keyframes_dict[branch]
-                if turn not in keyframes_dict_branch:
-                    keyframes_dict_branch[turn] = {tick}
-                else:
-                    keyframes_dict_branch[turn].add(tick)
-            keyframes_times.add((branch, turn, tick))
+            add_keyframe_time(branch, turn, tick)
         self._load_at(*self._btt())
 
         last_plan = -1
@@ -726,6 +839,13 @@ class ORM(object):
             parent, _, _, _, _ = self._branches[parent]
             self._branch_parents[child].add(parent)
 
+    def _add_keyframe_time(self, branch, turn, tick):
+        """Remember that there's a keyframe at this time"""
+        if (branch, turn, tick) in self._keyframes_times:
+            return
+        self._keyframes_times.add((branch, turn, tick))
+        insort(self._keyframes_by_branch[branch], (turn, tick))
+
     def _snap_keyframe(self, graph, branch, turn, tick, nodes, edges,
                        graph_val):
         nodes_keyframes_branch_d = self._nodes_cache.keyframe[graph, ][branch]
@@ -753,12 +873,9 @@ class ORM(object):
                 edge_val_keyframe_branch_d = evck[graph, orig, dest, 0][branch]
                 edges_keyframe_branch_d = eck[graph, orig, dest][branch]
                 if turn in edges_keyframe_branch_d:
-                    edges_keyframe_branch_d[turn][tick] = {}
+                    edges_keyframe_branch_d[turn][tick] = {0: True}
                 else:
-                    edges_keyframe_branch_d[turn] = {tick: {}}
-                ekbdrt = edges_keyframe_branch_d[turn][tick]
-                ekbdrt[0] = True
-                assert edges_keyframe_branch_d[turn][tick][0]
+                    edges_keyframe_branch_d[turn] = {tick: {0: True}}
                 if turn in edge_val_keyframe_branch_d:
                     edge_val_keyframe_branch_d[turn][tick] = vals
                 else:
@@ -773,8 +890,7 @@ class ORM(object):
         branch, turn, tick = self._btt()
         snapp = self._snap_keyframe
         kfl = self._keyframes_list
-        kfd = self._keyframes_dict
-        kfs = self._keyframes_times
+        add_keyframe_time = self._add_keyframe_time
         nkfs = self._new_keyframes
         for graphn, graph in self.graph.items():
             nodes = graph._nodes_state()
@@ -783,118 +899,66 @@ class ORM(object):
             snapp(graphn, branch, turn, tick, nodes, edges, val)
             nkfs.append((graphn, branch, turn, tick, nodes, edges, val))
             kfl.append((graphn, branch, turn, tick))
-            kfs.add((branch, turn, tick))
-            if branch not in kfd:
-                kfd[branch] = {
-                    turn: {
-                        tick,
-                    }
-                }
-            elif turn not in kfd[branch]:
-                kfd[branch][turn] = {
-                    tick,
-                }
-            else:
-                kfd[branch][turn].add(tick)
+            add_keyframe_time(branch, turn, tick)
 
     def _load_at(self, branch, turn, tick):
         snap_keyframe = self._snap_keyframe
         latest_past_keyframe = None
         earliest_future_keyframe = None
         branch_now, turn_now, tick_now = branch, turn, tick
-        branch_parents = self._branch_parents
-        for (branch, turn, tick) in \
-                    self._keyframes_times:
-            # Figure out the latest keyframe that is earlier than the present moment,
-            # and the earliest keyframe that is later than the present moment,
-            # for each graph.
-            # Can I avoid iterating over the entire keyframes table, somehow?
-            if branch == branch_now:
-                if turn < turn_now:
-                    if latest_past_keyframe:
-                        late_branch, late_turn, late_tick = latest_past_keyframe
-                        if late_branch != branch or late_turn < turn or (
-                                late_turn == turn and late_tick < tick):
-                            latest_past_keyframe = (branch, turn, tick)
-                    else:
-                        latest_past_keyframe = (branch, turn, tick)
-                elif turn > turn_now:
-                    if earliest_future_keyframe:
-                        early_branch, early_turn, early_tick = earliest_future_keyframe
-                        if early_branch != branch or early_turn > turn or (
-                                early_turn == turn and early_tick > tick):
-                            earliest_future_keyframe = (branch, turn, tick)
-                    else:
-                        earliest_future_keyframe = (branch, turn, tick)
-                elif tick < tick_now:
-                    if latest_past_keyframe:
-                        late_branch, late_turn, late_tick = latest_past_keyframe
-                        if late_branch != branch or late_turn < turn or (
-                                late_turn == turn and late_tick < tick):
-                            latest_past_keyframe = (branch, turn, tick)
-                    else:
-                        latest_past_keyframe = (branch, turn, tick)
-                elif tick > tick_now:
-                    if earliest_future_keyframe:
-                        early_branch, early_turn, early_tick = earliest_future_keyframe
-                        if early_branch != branch or early_turn > turn or (
-                                early_turn == turn and early_tick > tick):
-                            earliest_future_keyframe = (branch, turn, tick)
-                    else:
-                        earliest_future_keyframe = (branch, turn, tick)
-                else:
-                    latest_past_keyframe = (branch, turn, tick)
-            elif branch in branch_parents[branch_now]:
-                if latest_past_keyframe:
-                    late_branch, late_turn, late_tick = latest_past_keyframe
-                    if branch == late_branch:
-                        if turn > late_turn or (turn == late_turn
-                                                and tick > late_tick):
-                            latest_past_keyframe = (branch, turn, tick)
-                    elif late_branch in branch_parents[branch]:
-                        latest_past_keyframe = (branch, turn, tick)
-                else:
-                    latest_past_keyframe = (branch, turn, tick)
-            # If branch is a descendant of branch_now, don't load the keyframe there,
-            # because then we'd potentially be loading keyframes from any number of
-            # possible futures, and we're trying to be conservative about what we load.
-            # If neither branch is an ancestor of the other, we can't use the keyframe
-            # for this load.
+        # The latest keyframe at or before the present moment, and the
+        # earliest one after it, in this branch.
+        kf_times = self._keyframes_by_branch.get(branch_now)
+        if kf_times:
+            i = bisect_right(kf_times, (turn_now, tick_now))
+            if i:
+                latest_past_keyframe = (branch_now, ) + kf_times[i - 1]
+            if i < len(kf_times):
+                earliest_future_keyframe = (branch_now, ) + kf_times[i]
+        if latest_past_keyframe is None:
+            # Failing that, the latest keyframe in the nearest ancestor
+            # branch that has any.
+            # Keyframes in descendant branches are never used, because then
+            # we'd potentially be loading keyframes from any number of
+            # possible futures, and we're trying to be conservative about
+            # what we load.
+            branches = self._branches
+            kfbranch = branch_now
+            while kfbranch in branches:
+                kfbranch = branches[kfbranch][0]
+                kf_times = self._keyframes_by_branch.get(kfbranch)
+                if kf_times:
+                    latest_past_keyframe = (kfbranch, ) + kf_times[-1]
+                    break
         loaded = self._loaded
+        now = (turn_now, tick_now)
         if earliest_future_keyframe:
-            kfb, kfr, kft = earliest_future_keyframe
+            kfb = earliest_future_keyframe[0]
+            kftime = earliest_future_keyframe[1:]
             if kfb in loaded:
-                early_turn, early_tick, late_turn, late_tick = loaded[kfb]
-                if kfr > late_turn or (kfr == late_turn and kft > late_tick):
-                    loaded[kfb] = early_turn, early_tick, kfr, kft
+                early, late = loaded[kfb]
+                loaded[kfb] = early, max(late, kftime)
             elif kfb == branch_now:
-                if kfr > turn_now or (kfr == turn_now and kft > tick_now):
-                    loaded[kfb] = (turn_now, tick_now, kfr, kft)
+                if kftime > now:
+                    loaded[kfb] = now, kftime
             else:
-                loaded[kfb] = (kfr, kft, kfr, kft)
+                loaded[kfb] = kftime, kftime
         if latest_past_keyframe:
-            kfb, kfr, kft = latest_past_keyframe
+            kfb = latest_past_keyframe[0]
+            kftime = latest_past_keyframe[1:]
             if kfb in loaded:
-                early_turn, early_tick, late_turn, late_tick = loaded[kfb]
-                if kfr < early_turn or (kfr == early_turn
-                                        and kft < early_tick):
-                    loaded[kfb] = kfr, kft, late_turn, late_tick
+                early, late = loaded[kfb]
+                loaded[kfb] = min(early, kftime), late
             elif kfb == branch_now:
-                if kfr < turn_now or (kfr == turn_now and kft < tick_now):
-                    loaded[kfb] = (kfr, kft, turn_now, tick_now)
+                if kftime < now:
+                    loaded[kfb] = kftime, now
             else:
-                loaded[kfb] = (kfr, kft, kfr, kft)
+                loaded[kfb] = kftime, kftime
         if branch_now in loaded:
-            early_turn, early_tick, late_turn, late_tick = loaded[branch_now]
-            if turn_now < early_turn or (turn_now == early_turn
-                                         and tick_now < early_tick):
-                early_turn, early_tick = turn_now, tick_now
-            elif turn_now > late_turn or (turn_now == late_turn
-                                          and tick_now > late_tick):
-                late_turn, late_tick = turn_now, tick_now
-            loaded[branch_now] = early_turn, early_tick, late_turn, late_tick
+            early, late = loaded[branch_now]
+            loaded[branch_now] = min(early, now), max(late, now)
         else:
-            loaded[branch_now] = turn_now, tick_now, turn_now, tick_now
+            loaded[branch_now] = now, now
         noderows = []
         edgerows = []
         graphvalrows = []
@@ -910,14 +974,9 @@ class ORM(object):
         if latest_past_keyframe is None:  # happens in very short games
 
             def updload(branch, turn, tick):
-                (early_turn, early_tick, late_turn, late_tick) = loaded[branch]
-                if turn < early_turn or (turn == early_turn
-                                         and tick < early_tick):
-                    (early_turn, early_tick) = (turn, tick)
-                if turn > late_turn or (turn == late_turn
-                                        and tick > late_tick):
-                    (late_turn, late_tick) = (turn, tick)
-                loaded[branch] = (early_turn, early_tick, late_turn, late_tick)
+                early, late = loaded[branch]
+                time = (turn, tick)
+                loaded[branch] = min(early, time), max(late, time)
 
             for (graph, node, branch, turn, tick,
                  ex) in self.query.nodes_dump():
@@ -957,105 +1016,40 @@ class ORM(object):
             snap_keyframe(graph, past_branch, past_turn, past_tick, nodes,
                           edges, graph_val)
             if earliest_future_keyframe is None:
-                start_turn, start_tick, end_turn, end_tick = loaded.get(
-                    branch, (turn_now, tick_now, turn_now, tick_now))
-                if past_turn < start_turn or (past_turn == start_turn
-                                              and past_tick < start_tick):
-                    (start_turn, start_tick) = (past_turn, past_tick)
-                for (graph, node, branch, turn, tick,
-                     ex) in load_nodes(graph, past_branch, past_turn,
-                                       past_tick):
-                    noderows.append((graph, node, branch, turn, tick, ex
-                                     or None))
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for (graph, orig, dest, idx, branch, turn, tick,
-                     ex) in load_edges(graph, past_branch, past_turn,
-                                       past_tick):
-                    edgerows.append(
-                        (graph, orig, dest, idx, branch, turn, tick, ex
-                         or None))
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for row in load_graph_val(graph, past_branch, past_turn,
-                                          past_tick):
-                    graphvalrows.append(row)
-                    turn = row[3]
-                    tick = row[4]
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for row in load_node_val(graph, past_branch, past_turn,
-                                         past_tick):
-                    nodevalrows.append(row)
-                    turn = row[4]
-                    tick = row[5]
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for row in load_edge_val(graph, past_branch, past_turn,
-                                         past_tick):
-                    edgevalrows.append(row)
-                    turn = row[6]
-                    tick = row[7]
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                (start_turn0, start_tick0, end_turn0, end_tick0) = loaded.get(
-                    branch, (turn_now, tick_now, turn_now, tick_now))
-                if start_turn < start_turn0 or (start_turn == start_turn0
-                                                and start_tick < start_tick0):
-                    (start_turn1, start_tick1) = (start_turn, start_tick)
-                else:
-                    (start_turn1, start_tick1) = (start_turn0, start_tick0)
-                if end_turn > end_turn0 or (end_turn == end_turn0
-                                            and end_tick > end_tick0):
-                    (end_turn1, end_tick1) = (end_turn, end_tick)
-                else:
-                    (end_turn1, end_tick1) = (end_turn0, end_tick0)
-                loaded[branch] = (start_turn1, start_tick1, end_turn1,
-                                  end_tick1)
+                # Everything from the keyframe onward is loaded now, up to
+                # the latest change in the database.
+                start, end = loaded.get(past_branch, (now, now))
+                start = min(start, (past_turn, past_tick))
+                end = _extend_to_latest(
+                    noderows,
+                    load_nodes(graph, past_branch, past_turn, past_tick), 3,
+                    end)
+                end = _extend_to_latest(
+                    edgerows,
+                    load_edges(graph, past_branch, past_turn, past_tick), 5,
+                    end)
+                end = _extend_to_latest(
+                    graphvalrows,
+                    load_graph_val(graph, past_branch, past_turn, past_tick),
+                    3, end)
+                end = _extend_to_latest(
+                    nodevalrows,
+                    load_node_val(graph, past_branch, past_turn, past_tick),
+                    4, end)
+                end = _extend_to_latest(
+                    edgevalrows,
+                    load_edge_val(graph, past_branch, past_turn, past_tick),
+                    6, end)
+                loaded[past_branch] = start, end
                 continue
             future_branch, future_turn, future_tick = earliest_future_keyframe
             if past_branch == future_branch:
-                for (graph, node, branch, turn, tick,
-                     ex) in load_nodes(graph, past_branch, past_turn,
-                                       past_tick, future_turn, future_tick):
-                    noderows.append((graph, node, branch, turn, tick, ex
-                                     or None))
-                for (graph, orig, dest, idx, branch, turn, tick,
-                     ex) in load_edges(graph, past_branch, past_turn,
-                                       past_tick, future_turn, future_tick):
-                    edgerows.append(
-                        (graph, orig, dest, idx, branch, turn, tick, ex
-                         or None))
+                noderows.extend(
+                    load_nodes(graph, past_branch, past_turn, past_tick,
+                               future_turn, future_tick))
+                edgerows.extend(
+                    load_edges(graph, past_branch, past_turn, past_tick,
+                               future_turn, future_tick))
                 graphvalrows.extend(
                     load_graph_val(graph, past_branch, past_turn, past_tick,
                                    future_turn, future_tick))
@@ -1066,19 +1060,12 @@ class ORM(object):
                     load_edge_val(graph, past_branch, past_turn, past_tick,
                                   future_turn, future_tick))
                 if branch in loaded:
-                    early_turn, early_tick, late_turn, late_tick = loaded[
-                        branch]
-                    if past_turn < early_turn or (past_turn == early_turn
-                                                  and past_tick < early_tick):
-                        early_turn, early_tick = past_turn, past_tick
-                    if future_turn > late_turn or (future_turn == late_turn and
-                                                   future_tick > late_tick):
-                        late_turn, late_tick = future_turn, future_tick
-                    loaded[branch] = (early_turn, early_tick, late_turn,
-                                      late_tick)
+                    early, late = loaded[branch]
+                    loaded[branch] = (min(early, (past_turn, past_tick)),
+                                      max(late, (future_turn, future_tick)))
                 else:
-                    loaded[branch] = (past_turn, past_tick, future_turn,
-                                      future_tick)
+                    loaded[branch] = ((past_turn, past_tick),
+                                      (future_turn, future_tick))
                 continue
             parentage_iter = iter_parent_btt(future_branch, future_turn,
                                              future_tick)
@@ -1095,69 +1082,20 @@ class ORM(object):
             if not windows:
                 continue  # I think this would happen when we are only loading an initial state
             for window in reversed(windows):  # chronological ordering
-                start_turn, start_tick, end_turn, end_tick = loaded[branch]
-                for (graph, node, branch, turn, tick,
-                     ex) in load_nodes(graph, *window):
-                    noderows.append((graph, node, branch, turn, tick, ex
-                                     or None))
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for (graph, orig, dest, idx, branch, turn, tick,
-                     ex) in load_edges(graph, *window):
-                    edgerows.append(
-                        (graph, orig, dest, idx, branch, turn, tick, ex
-                         or None))
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for row in load_graph_val(graph, *window):
-                    graphvalrows.append(row)
-                    turn = row[3]
-                    tick = row[4]
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for row in load_node_val(graph, *window):
-                    nodevalrows.append(row)
-                    turn = row[4]
-                    tick = row[5]
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                for row in load_edge_val(graph, *window):
-                    edgevalrows.append(row)
-                    turn = row[6]
-                    tick = row[7]
-                    if turn > end_turn:
-                        (end_turn, end_tick) = (turn, tick)
-                    elif turn == end_turn and tick > end_tick:
-                        end_tick = tick
-                    if turn < start_turn:
-                        (start_turn, start_tick) = (turn, tick)
-                    elif turn == start_turn and tick < start_tick:
-                        start_tick = tick
-                loaded[branch] = (start_turn, start_tick, end_turn, end_tick)
+                noderows.extend(load_nodes(graph, *window))
+                edgerows.extend(load_edges(graph, *window))
+                graphvalrows.extend(load_graph_val(graph, *window))
+                nodevalrows.extend(load_node_val(graph, *window))
+                edgevalrows.extend(load_edge_val(graph, *window))
+                # The whole window is loaded now
+                window_branch, turn_from, tick_from, turn_to, tick_to = window
+                if window_branch in loaded:
+                    early, late = loaded[window_branch]
+                    loaded[window_branch] = (min(early, (turn_from, tick_from)),
+                                             max(late, (turn_to, tick_to)))
+                else:
+                    loaded[window_branch] = ((turn_from, tick_from),
+                                             (turn_to, tick_to))
         with self.batch():
             self._nodes_cache.load(noderows)
             self._edges_cache.load(edgerows)
@@ -1173,8 +1111,8 @@ class ORM(object):
         # find the slices of time that need to stay loaded
         branch, turn, tick = self._btt()
         iter_parent_btt = self._iter_parent_btt
-        kfd = self._keyframes_dict
-        if not kfd:
+        keyframes_by_branch = self._keyframes_by_branch
+        if not keyframes_by_branch:
             return
         loaded = self._loaded
         to_keep = {}
@@ -1184,37 +1122,24 @@ class ORM(object):
                 branch, turn, tick):
             if past_branch not in loaded:
                 continue  # nothing happened in this branch i guess
-            early_turn, early_tick, late_turn, late_tick = loaded[past_branch]
-            if past_branch in kfd:
-                for kfturn, kfticks in kfd[past_branch].items():
-                    # this can't possibly perform very well.
-                    # Maybe I need another loadedness dict that gives the two
-                    # keyframes I am between and gets upkept upon time travel
-                    for kftick in kfticks:
-                        if loaded_keep_test(kfturn, kftick, early_turn,
-                                            early_tick, late_turn, late_tick):
-                            if (kfturn < turn or
-                                (kfturn == turn and kftick < tick)) and (
-                                    kfturn > early_turn or
-                                    (kfturn == early_turn
-                                     and kftick > early_tick)):
-                                early_turn, early_tick = kfturn, kftick
-                            elif (kfturn > turn or
-                                  (kfturn == turn and kftick >= tick)) and (
-                                      kfturn < late_turn or
-                                      (kfturn == late_turn
-                                       and kftick < late_tick)):
-                                late_turn, late_tick = kfturn, kftick
-                assert loaded_keep_test(
-                    past_turn, past_tick, early_turn, early_tick, late_turn,
-                    late_tick
-                ), "Unloading failed due to an invalid cache state"
-                to_keep[
-                    past_branch] = early_turn, early_tick, past_turn, past_tick
+            early, late = loaded[past_branch]
+            kf_times = keyframes_by_branch.get(past_branch)
+            if kf_times:
+                # Narrow the range to the keyframes on either side of now,
+                # among those already loaded
+                lo = bisect_left(kf_times, early)
+                hi = bisect_right(kf_times, late)
+                i = bisect_left(kf_times, (turn, tick), lo, hi)
+                if i > lo and kf_times[i - 1] > early:
+                    early = kf_times[i - 1]
+                if i < hi and kf_times[i] < late:
+                    late = kf_times[i]
+                assert early <= (past_turn, past_tick) <= late, \
+                    "Unloading failed due to an invalid cache state"
+                to_keep[past_branch] = early, (past_turn, past_tick)
                 break
             else:
-                to_keep[
-                    past_branch] = early_turn, early_tick, late_turn, late_tick
+                to_keep[past_branch] = early, late
         if not to_keep:
             # unloading literally everything would make the game unplayable,
             # so don't
@@ -1222,8 +1147,8 @@ class ORM(object):
                 self.warning("Not unloading, due to lack of keyframes")
             return
         caches = self._caches
-        for past_branch, (early_turn, early_tick, late_turn,
-                          late_tick) in to_keep.items():
+        for past_branch, ((early_turn, early_tick),
+                          (late_turn, late_tick)) in to_keep.items():
             for cache in caches:
                 cache.truncate(past_branch, early_turn, early_tick, 'backward')
                 cache.truncate(past_branch, late_turn, late_tick, 'forward')
@@ -1255,10 +1180,10 @@ class ORM(object):
             return False
         if turn is None:
             return True
+        early, late = loaded[branch]
         if tick is not None:
-            return loaded_keep_test(turn, tick, *loaded[branch])
-        (past_turn, past_tick, future_turn, future_tick) = loaded[branch]
-        return past_turn <= turn <= future_turn
+            return early <= (turn, tick) <= late
+        return early[0] <= turn <= late[0]
 
     def __enter__(self):
         """Enable the use of the ``with`` keyword"""
@@ -1281,9 +1206,7 @@ class ORM(object):
             raise ValueError(
                 "The branch {} seems not to have ever been created".format(
                     child))
-        if self._branches[child][0] == parent:
-            return True
-        return self.is_parent_of(parent, self._branches[child][0])
+        return parent in self._branch_parents[child]
 
     def _get_branch(self):
         return self._obranch
@@ -1311,7 +1234,7 @@ class ORM(object):
             # been finalized.
             self.query.new_branch(v, curbranch, curturn, curtick)
             self._branches[v] = curbranch, curturn, curtick, curturn, curtick
-            self._upd_branch_parentage(v, curbranch)
+            self._upd_branch_parentage(curbranch, v)
             self._turn_end_plan[v, curturn] = self._turn_end[v,
                                                              curturn] = curtick
         self._obranch = v
@@ -1319,16 +1242,13 @@ class ORM(object):
         loaded = self._loaded
         if branch_is_new:
             self._copy_plans(curbranch, curturn, curtick)
-            loaded[v] = (curturn, tick, curturn, tick)
+            loaded[v] = ((curturn, tick), (curturn, tick))
             return
         elif v not in loaded:
             self._load_at(v, curturn, tick)
             return
-        (start_turn, start_tick, end_turn, end_tick) = loaded[v]
-        if (curturn > end_turn or
-            (curturn == end_turn and tick > end_tick)) or (
-                curturn < start_turn or
-                (curturn == start_turn and tick < start_tick)):
+        early, late = loaded[v]
+        if not early <= (curturn, tick) <= late:
             self._load_at(v, curturn, tick)
 
     def _copy_plans(self, branch_from, turn_from, tick_from):
@@ -1419,14 +1339,14 @@ class ORM(object):
         if v == self.turn:
             self._otick = tick = self._turn_end_plan[tuple(self.time)]
             if branch not in loaded:
-                loaded[branch] = (v, tick, v, tick)
+                loaded[branch] = ((v, tick), (v, tick))
                 return
-            (start_turn, start_tick, end_turn, end_tick) = loaded[branch]
-            if v > end_turn or (v == end_turn and tick > end_tick):
+            early, late = loaded[branch]
+            if (v, tick) > late:
                 if (branch, v, tick) in self._keyframes_times:
                     self._load_at(branch, v, tick)
                 else:
-                    loaded[branch] = (start_turn, start_tick, end_turn, tick)
+                    loaded[branch] = (early, (v, tick))
             return
         if not isinstance(v, int):
             raise TypeError("turn must be an integer")
@@ -1449,17 +1369,17 @@ class ORM(object):
                 tick = 0
             self._load_at(branch, v, tick)
         else:
-            (start_turn, start_tick, end_turn, end_tick) = loaded[branch]
+            early, late = loaded[branch]
             if (branch, v) in self._turn_end_plan:
                 tick = self._turn_end_plan[(branch, v)]
             else:
                 self._turn_end_plan[(branch, v)] = tick = 0
-            if v > end_turn or (v == end_turn and tick > end_tick):
+            if (v, tick) > late:
                 if (branch, v, tick) in self._keyframes_times:
                     self._load_at(branch, v, tick)
                 else:
-                    loaded[branch] = (start_turn, start_tick, v, tick)
-            elif v < start_turn or (v == start_turn and tick < start_tick):
+                    loaded[branch] = (early, (v, tick))
+            elif (v, tick) < early:
                 self._load_at(branch, v, tick)
         self._otick = tick
         self._oturn = v
@@ -1498,13 +1418,13 @@ class ORM(object):
         if branch not in loaded:
             self._load_at(branch, turn, v)
             return
-        (start_turn, start_tick, end_turn, end_tick) = loaded[branch]
-        if turn > end_turn or (turn == end_turn and v > end_tick):
-            if (branch, end_turn, end_tick) in self._keyframes_times:
+        early, late = loaded[branch]
+        if (turn, v) > late:
+            if (branch, ) + late in self._keyframes_times:
                 self._load_at(branch, turn, v)
                 return
-            loaded[branch] = (start_turn, start_tick, turn, v)
-        elif turn < start_turn or (turn == start_turn and v < start_tick):
+            loaded[branch] = (early, (turn, v))
+        elif (turn, v) < early:
             self._load_at(branch, turn, v)
 
     # easier to override things this way
@@ -1562,14 +1482,10 @@ class ORM(object):
         branches[branch] = parent, turn_start, tick_start, turn_end, tick
         loaded = self._loaded
         if branch in loaded:
-            (early_turn, early_tick, late_turn, late_tick) = loaded[branch]
-            if turn > late_turn:
-                (late_turn, late_tick) = (turn, tick)
-            elif turn == late_turn and tick > late_tick:
-                late_tick = tick
-            loaded[branch] = (early_turn, early_tick, late_turn, late_tick)
+            early, late = loaded[branch]
+            loaded[branch] = (early, max(late, (turn, tick)))
         else:
-            loaded[branch] = (turn, tick, turn, tick)
+            loaded[branch] = ((turn, tick), (turn, tick))
         self._otick = tick
         return branch, turn, tick
 
@@ -1599,8 +1515,9 @@ class ORM(object):
             self.query.keyframes_insert_many(self._new_keyframes)
             self._new_keyframes = []
         self.query.commit()
-        self._plans_uncommitted = []
-        self._plan_ticks_uncommitted = []
+        # Cleared in place, because _nbtt keeps its own reference
+        self._plans_uncommitted.clear()
+        self._plan_ticks_uncommitted.clear()
 
     def close(self):
         """Write changes to database and close the connection"""
@@ -1609,15 +1526,12 @@ class ORM(object):
 
     def _nudge_loaded(self, branch, turn, tick):
         loaded = self._loaded
+        time = (turn, tick)
         if branch in loaded:
-            past_turn, past_tick, future_turn, future_tick = loaded[branch]
-            if turn < past_turn or (turn == past_turn and tick < past_tick):
-                loaded[branch] = turn, tick, future_turn, future_tick
-            elif turn > future_turn or (turn == future_turn
-                                        and tick > future_tick):
-                loaded[branch] = past_turn, past_tick, turn, tick
+            early, late = loaded[branch]
+            loaded[branch] = min(early, time), max(late, time)
         else:
-            loaded[branch] = turn, tick, turn, tick
+            loaded[branch] = time, time
 
     def _init_graph(self, name, type_s='DiGraph', data=None):
         if self.query.have_graph(name):
@@ -1663,8 +1577,7 @@ class ORM(object):
             branch, turn, tick = self._btt()
             snapp = self._snap_keyframe
             kfl = self._keyframes_list
-            kfd = self._keyframes_dict
-            kfs = self._keyframes_times
+            add_keyframe_time = self._add_keyframe_time
             nkfs = self._new_keyframes
             already_keyframed = {nkf[:4] for nkf in self._new_keyframes}
             for graphn in others:
@@ -1677,19 +1590,7 @@ class ORM(object):
                 snapp(graphn, branch, turn, tick, nodes, edges, val)
                 nkfs.append((graphn, branch, turn, tick, nodes, edges, val))
                 kfl.append((graphn, branch, turn, tick))
-                kfs.add((branch, turn, tick))
-                if branch not in kfd:
-                    kfd[branch] = {
-                        turn: {
-                            tick,
-                        }
-                    }
-                elif turn not in kfd[branch]:
-                    kfd[branch][turn] = {
-                        tick,
-                    }
-                else:
-                    kfd[branch][turn].add(tick)
+                add_keyframe_time(branch, turn, tick)
 
     def new_graph(self, name, data=None, **attr):
         """Return a new instance of type Graph, initialized with the given
@@ -293,7 +293,7 @@ def queries_for_table_dict(table):
         'graphs_types':
         select([table['graphs'].c.graph, table['graphs'].c.type]),
         'graphs_named':
-        select([func.COUNT()]).select_from(table['graphs']).where(
+        select([func.count()]).select_from(table['graphs']).where(
             table['graphs'].c.graph == bindparam('graph')),
         'update_branches':
         table['branches'].update().values(
@@ -397,7 +397,7 @@ def queries_for_table_dict(table):
         r[t.name + '_dump'] = select(list(t.c.values())).order_by(*key)
         r[t.name + '_insert'] = t.insert().values(
             tuple(bindparam(cname) for cname in t.c.keys()))
-        r[t.name + '_count'] = select([func.COUNT()]).select_from(t)
+        r[t.name + '_count'] = select([func.count()]).select_from(t)
         r[t.name + '_del'] = t.delete().where(
             and_(*[c == bindparam(c.name) for c in t.primary_key]))
     return r
@@ -265,10 +265,9 @@ class Node(AbstractEntityMapping):
         return True
 
     def __new__(cls, graph, node):
-        gnn = (graph.name, node)
-        nobjs = graph.db._node_objs
-        if gnn in nobjs:
-            ret = nobjs[gnn]
+        nobjs = graph.db._node_objs[graph.name]
+        if node in nobjs:
+            ret = nobjs[node]
             if not isinstance(ret, cls):
                 raise EntityCollisionError(
                     "Already have node {} in graph {}, but it's of class {}".
@@ -341,10 +340,10 @@ class Edge(AbstractEntityMapping):
     set_db_time = set_cache_time = 0
 
     def __new__(cls, graph, orig, dest, idx=0):
-        gnodi = (graph.name, orig, dest, idx)
-        edgeobjs = graph.db._edge_objs
-        if gnodi in edgeobjs:
-            ret = edgeobjs[gnodi]
+        odi = (orig, dest, idx)
+        edgeobjs = graph.db._edge_objs[graph.name]
+        if odi in edgeobjs:
+            ret = edgeobjs[odi]
             if not isinstance(ret, cls):
                 raise EntityCollisionError(
                     "Already have an edge {}->{}[{}] in graph {}, but of class {}"
@@ -492,9 +491,9 @@ class GraphNodeMapping(AllegedMapping):
                                  False)
         self.db._nodes_cache.store(self.graph.name, node, branch, turn, tick,
                                    False)
-        key = (self.graph.name, node)
-        if node in self.db._node_objs:
-            del self.db._node_objs[key]
+        node_objs = self.db._node_objs[self.graph.name]
+        if node in node_objs:
+            del node_objs[node]
         self.send(self, node_name=node, exists=False)
 
 
@@ -37,6 +37,34 @@ IntegrityError = (
     sqliteIntegError) if alchemyIntegError is not None else sqliteIntegError
 
 
+QUERIES_FORMAT_VERSION = 3
+"""Version of the format of ``sqlite.msgpack``, as written by alchemy.py"""
+
+
+def load_queries(path):
+    """Return the dictionary of SQL strings stored in ``path``
+
+    Prefers ``sqlite.msgpack``, which is quicker to load, as long as
+    msgpack is installed, it's in the format version I know, and it was
+    made from the ``sqlite.json`` that's there now.
+
+    """
+    from hashlib import sha256
+    with open(os.path.join(path, 'sqlite.json'), 'rb') as inf:
+        json_bytes = inf.read()
+    try:
+        import msgpack
+        with open(os.path.join(path, 'sqlite.msgpack'), 'rb') as inf:
+            packed = msgpack.unpackb(inf.read())
+        if (packed.get('v') == QUERIES_FORMAT_VERSION and packed.get(
+                'json_sha256') == sha256(json_bytes).hexdigest()):
+            return dict(packed['queries'])
+    except (OSError, ImportError):
+        pass
+    from json import loads
+    return loads(json_bytes)
+
+
 class TimeError(ValueError):
     """Exception class for problems with the time model"""
 
@@ -122,9 +150,7 @@ class QueryEngine(object):
 
         def lite_init(dbstring, connect_args):
             from sqlite3 import connect, Connection
-            from json import load
-            with open(os.path.join(self.path, 'sqlite.json')) as strf:
-                self.strings = load(strf)
+            self.strings = load_queries(self.path)
             if isinstance(dbstring, Connection):
                 self.connection = dbstring
             else:
@@ -461,8 +487,9 @@ class QueryEngine(object):
             it = self.sql('load_nodes_tick_to_tick', pack(graph), branch,
                           turn_from, turn_from, tick_from, turn_to, turn_to,
                           tick_to)
+        # Deleted nodes are stored as None in the nodes cache
         for (node, turn, tick, extant) in it:
-            yield graph, unpack(node), branch, turn, tick, extant
+            yield graph, unpack(node), branch, turn, tick, extant or None
 
     def node_val_dump(self):
         """Yield the entire contents of the node_val table."""
@@ -544,9 +571,10 @@ class QueryEngine(object):
             it = self.sql('load_edges_tick_to_tick', pack(graph), branch,
                           turn_from, turn_from, tick_from, turn_to, turn_to,
                           tick_to)
+        # Deleted edges are stored as None in the edges cache
         for (orig, dest, idx, turn, tick, extant) in it:
             yield graph, unpack(orig), unpack(
-                dest), idx, branch, turn, tick, extant
+                dest), idx, branch, turn, tick, extant or None
 
     def _pack_edge2set(self, tup):
         graph, orig, dest, idx, branch, turn, tick, extant = tup
@@ -66,6 +66,43 @@ def update_backward_window(turn_from, tick_from, turn_to, tick_to, updfun,
             updfun(*future_state)
 
 
+def iter_window(turn_from, tick_from, turn_to, tick_to, branchd):
+    """Iterate over the values in a window of time in ``branchd``
+
+    Like ``update_window``, but for when you'd rather loop over the
+    values yourself than have a function called on each.
+
+    """
+    windows = []
+    if turn_from in branchd:
+        # Not including the exact tick you started from because deltas are *changes*
+        windows.append(branchd[turn_from][tick_from + 1:])
+    for midturn in range(turn_from + 1, turn_to):
+        if midturn in branchd:
+            windows.append(branchd[midturn][:])
+    if turn_to in branchd:
+        windows.append(branchd[turn_to][:tick_to + 1])
+    return chain.from_iterable(windows)
+
+
+def iter_backward_window(turn_from, tick_from, turn_to, tick_to, branchd):
+    """Iterate backward over the values in a window of time in ``branchd``
+
+    Like ``update_backward_window``, but for when you'd rather loop over
+    the values yourself than have a function called on each.
+
+    """
+    windows = []
+    if turn_from in branchd:
+        windows.append(reversed(branchd[turn_from][:tick_from]))
+    for midturn in range(turn_from - 1, turn_to, -1):
+        if midturn in branchd:
+            windows.append(reversed(branchd[midturn][:]))
+    if turn_to in branchd:
+        windows.append(reversed(branchd[turn_to][tick_to + 1:]))
+    return chain.from_iterable(windows)
+
+
 class HistoryError(KeyError):
     """You tried to access the past in a bad way."""
     def __init__(self, *args, deleted=False):
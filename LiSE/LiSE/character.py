@@ -1132,15 +1132,15 @@ class Character(DiGraph, AbstractCharacter, RuleFollower):
             return self._make_thing(thing)
 
         def _make_thing(self, thing, val=None):
-            cache = self.engine._node_objs
+            cache = self.engine._node_objs[self.name]
             if isinstance(val, Thing):
-                th = cache[self.name, thing] = val
-            elif (self.name, thing) in cache:
-                th = cache[(self.name, thing)]
+                th = cache[thing] = val
+            elif thing in cache:
+                th = cache[thing]
                 if type(th) is not Thing:
-                    th = cache[self.name, thing] = Thing(self.character, thing)
+                    th = cache[thing] = Thing(self.character, thing)
             else:
-                th = cache[(self.name, thing)] = Thing(self.character, thing)
+                th = cache[thing] = Thing(self.character, thing)
             return th
 
         def __setitem__(self, thing, val):
@@ -1262,8 +1262,8 @@ class Character(DiGraph, AbstractCharacter, RuleFollower):
                                things_cache.count_entities, charn, btt)
             self._contains_stuff = (nodes_contains, things_contains, charn,
                                     btt)
-            self._get_stuff = self._contains_stuff + (engine._node_objs,
-                                                      character)
+            self._get_stuff = self._contains_stuff + (
+                engine._node_objs[charn], character)
             self._set_stuff = (engine._node_exists, engine._exist_node,
                                engine._get_node, charn, character)
 
@@ -1296,11 +1296,10 @@ class Character(DiGraph, AbstractCharacter, RuleFollower):
                                   tick) or things_contains(
                                       charn, place, branch, turn, tick):
                 raise KeyError("No such place: {}".format(place))
-            if (charn, place) not in cache or not isinstance(
-                    cache[(charn, place)], Place):
-                ret = cache[(charn, place)] = Place(character, place)
+            if place not in cache or not isinstance(cache[place], Place):
+                ret = cache[place] = Place(character, place)
                 return ret
-            return cache[(charn, place)]
+            return cache[place]
 
         def __setitem__(self, place, v):
             node_exists, exist_node, get_node, charn, character \
@@ -1619,11 +1618,11 @@ class Character(DiGraph, AbstractCharacter, RuleFollower):
                 super().__init__(container, dest)
                 graph = self.graph
                 self._setitem_stuff = (graph, graph.name, dest,
-                                       self.db._edge_objs)
+                                       self.db._edge_objs[graph.name])
 
             def __setitem__(self, orig, value):
                 graph, graph_name, dest, portal_objs = self._setitem_stuff
-                key = (graph_name, orig, dest)
+                key = (orig, dest, 0)
                 if key not in portal_objs:
                     portal_objs[key] = Portal(graph, orig, dest)
                 p = portal_objs[key]
@@ -1828,26 +1827,28 @@ class Character(DiGraph, AbstractCharacter, RuleFollower):
 
         """
         self.engine._set_thing_loc(self.name, name, location)
-        if (self.name, name) in self.engine._node_objs:
-            obj = self.engine._node_objs[self.name, name]
+        node_objs = self.engine._node_objs[self.name]
+        if name in node_objs:
+            obj = node_objs[name]
             thing = Thing(self, name)
             for port in obj.portals():
                 port.origin = thing
             for port in obj.preportals():
                 port.destination = thing
-            self.engine._node_objs[self.name, name] = thing
+            node_objs[name] = thing
 
     def thing2place(self, name):
         """Unset a Thing's location, and thus turn it into a Place."""
         self.engine._set_thing_loc(self.name, name, None)
-        if (self.name, name) in self.engine._node_objs:
-            thing = self.engine._node_objs[self.name, name]
+        node_objs = self.engine._node_objs[self.name]
+        if name in node_objs:
+            thing = node_objs[name]
             place = Place(self, name)
             for port in thing.portals():
                 port.origin = place
             for port in thing.preportals():
                 port.destination = place
-            self.engine._node_objs[self.name, name] = place
+            node_objs[name] = place
 
     def add_portal(self, origin, destination, symmetrical=False, **kwargs):
         """Connect the origin to the destination with a :class:`Portal`.
@@ -1444,7 +1444,7 @@ class Engine(AbstractEngine, gORM):
                 todo[rulebook].append((rule, handled, entity))
         avcache_retr = self._unitness_cache._base_retrieve
         node_exists = self._node_exists
-        get_node = self._get_node
+        get_node = self._get_node_by_name
         for (charn, graphn, avn, rulebook,
              rulen) in self._unit_rules_handled_cache.iter_unhandled_rules(
                  branch, turn, tick):
@@ -1485,7 +1485,7 @@ class Engine(AbstractEngine, gORM):
             if check_triggers(rule, handled, entity):
                 todo[rulebook].append((rule, handled, entity))
         edge_exists = self._edge_exists
-        get_edge = self._get_edge
+        get_edge = self._get_edge_by_name
         handled_char_port = self._handled_char_port
         for (
                 charn, orign, destn, rulebook, rulen
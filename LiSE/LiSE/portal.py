@@ -219,7 +219,8 @@ class Portal(Edge, RuleFollower):
                                      self.destination.name, branch, turn, tick,
                                      False)
         try:
-            del self.engine._edge_objs[(self.graph.name, self.orig, self.dest)]
+            del self.engine._edge_objs[self.graph.name][self.orig, self.dest,
+                                                       0]
         except KeyError:
             pass
         self.character.portal[self.origin.name].send(